@@ -0,0 +1,547 @@
+"""IWA Prompt performans ölçümleri
+
+Kullanım: python benchmark.py <ölçüm> [seçenekler]
+"""
+import argparse
+import csv
+import gzip
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+import iwaprompt
+
+
+def peak_rss_mb():
+    """Sürecin en yüksek bellek kullanımı (MB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_templates(args):
+    """Toplu şablon doldurma verimi ve bellek kullanımı"""
+    template = next(iter(iwaprompt.load_template_registry().values()))[0]
+
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = os.path.join(directory, "values.csv")
+        with open(source_path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(template.fields)
+            for i in range(args.rows):
+                writer.writerow([f"{field}_{i}" for field in template.fields])
+
+        rss_before = peak_rss_mb()
+        start = time.perf_counter()
+        with open(source_path, encoding="utf-8", newline="") as source, \
+                open(os.path.join(directory, "filled.csv"), "w", encoding="utf-8", newline="") as output:
+            written, skipped = iwaprompt.write_filled_templates(template, source, output)
+        elapsed = time.perf_counter() - start
+
+    print(f"şablon: {template.name}")
+    print(f"satır: {written} yazıldı, {skipped} atlandı")
+    print(f"süre: {elapsed:.2f} sn ({written / elapsed:,.0f} satır/sn)")
+    print(f"tepe bellek artışı: {peak_rss_mb() - rss_before:.1f} MB")
+
+
+def synthetic_corpus(rows, seed=0):
+    """Ölçümler için rastgele prompt korpusu"""
+    rng = random.Random(seed)
+    roles = ["Business Analyst", "Marketing Expert", "Content Creator", "Sales Representative",
+             "Project Manager", "Software Developer", "Data Scientist", "Copywriter"]
+    words = ["şirket", "için", "müşteri", "analiz", "rapor", "marketing", "yazılım", "satış",
+             "örnek", "hedef", "plan", "python", "tablo", "liste", "strateji", "kampanya",
+             "write", "create", "audience", "data", "growth", "2024", "%15", "b2b"]
+    return pd.DataFrame({
+        "act": [f"{rng.choice(roles)} {i}" for i in range(rows)],
+        "prompt": [" ".join(rng.choice(words) for _ in range(rng.randint(8, 60))) for _ in range(rows)]
+    })
+
+
+def bench_concurrency(args):
+    """filter_prompts ve analyze_prompt_quality için eşzamanlı oturum stres testi"""
+    df = synthetic_corpus(args.rows)
+    searches = [("marketing", "Tümü"), ("", "Data Scientist"), ("müşteri", "Copywriter"), ("python", "Tümü")]
+    prompts = list(df["prompt"].sample(args.prompts, random_state=1))
+
+    # Tek iş parçacıklı referans sonuçlar
+    expected_filters = {query: list(iwaprompt.filter_prompts(df, *query).index) for query in searches}
+    expected_scores = {prompt: iwaprompt.analyze_prompt_quality(prompt)["score"] for prompt in prompts}
+
+    def session(seed):
+        rng = random.Random(seed)
+        for _ in range(args.ops):
+            query = rng.choice(searches)
+            assert list(iwaprompt.filter_prompts(df, *query).index) == expected_filters[query], query
+            for prompt in rng.sample(prompts, 10):
+                assert iwaprompt.analyze_prompt_quality(prompt)["score"] == expected_scores[prompt]
+
+    print(f"korpus: {args.rows} satır, oturum başına {args.ops} işlem")
+    baseline = None
+    for threads in args.threads:
+        iwaprompt.SCORE_CACHE.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for future in [pool.submit(session, seed) for seed in range(threads)]:
+                future.result()
+        elapsed = time.perf_counter() - start
+        throughput = threads * args.ops / elapsed
+        baseline = baseline or throughput
+        print(f"{threads:>3} oturum: {throughput:8.1f} işlem/sn  (x{throughput / baseline:.2f})  doğru")
+
+
+class SourceStandIn(BaseHTTPRequestHandler):
+    """Yerel HTTP kaynak taklidi: /<gecikme>/<satır> gzip'li CSV döndürür, /flaky önce 503 verir"""
+
+    flaky_hits = 0
+
+    def do_GET(self):
+        if self.path == "/flaky":
+            SourceStandIn.flaky_hits += 1
+            if SourceStandIn.flaky_hits == 1:
+                self.send_response(503)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            delay, rows = 0.1, 50
+        elif self.path == "/nocharset":
+            # Dahili uç noktalar gibi charset belirtmeden UTF-8 Türkçe içerik
+            body = "act,prompt\nİçerik Yazarı,\"Müşteri için ürün açıklaması yaz\"\n".encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        else:
+            delay, rows = self.path.strip("/").split("/")
+            delay, rows = float(delay), int(rows)
+
+        time.sleep(delay)
+        text = "act,prompt\n" + "".join(f'{self.path} {i},"Prompt {i} from {self.path}"\n' for i in range(rows))
+        body = gzip.compress(text.encode("utf-8"))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/csv; charset=utf-8")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def bench_sources(args):
+    """Çok kaynaklı korpus yüklemesi: toplam süre en yavaş kaynağa yakın olmalı"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SourceStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    with tempfile.TemporaryDirectory() as directory:
+        local_path = os.path.join(directory, "internal.csv")
+        with open(local_path, "w", encoding="utf-8") as file:
+            file.write("role,text\nIWA Analyst,\"Internal prompt\"\n")
+
+        sources = [{"name": f"http-{delay}", "url": f"{base}/{delay}/{args.rows}"} for delay in args.delays]
+        sources.append({"name": "flaky", "url": f"{base}/flaky"})
+        sources.append({"name": "nocharset", "url": f"{base}/nocharset"})
+        sources.append({"name": "local", "path": local_path, "columns": {"role": "act", "text": "prompt"}})
+
+        start = time.perf_counter()
+        df, errors = iwaprompt.load_prompt_sources(sources)
+        elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    assert not errors, errors
+    assert list(df.columns) == ["act", "prompt", "source"]
+    assert len(df) == args.rows * len(args.delays) + 50 + 1 + 1, len(df)
+    assert "Müşteri için ürün açıklaması yaz" in set(df["prompt"]), "charset'siz kaynak yanlış çözüldü"
+    assert set(df["source"]) == {source["name"] for source in sources}
+
+    print(f"kaynak: {len(sources)}, satır: {len(df)}")
+    print(f"en yavaş kaynak: {max(args.delays):.2f} sn, toplam gecikme: {sum(args.delays):.2f} sn")
+    print(f"yükleme süresi: {elapsed:.2f} sn")
+
+
+def bench_tokens(args):
+    """Vektörel token sayımı: tüm korpus saniyeler içinde"""
+    df = synthetic_corpus(args.rows)
+
+    start = time.perf_counter()
+    counts = iwaprompt.estimate_tokens_series(df["prompt"])
+    elapsed = time.perf_counter() - start
+
+    sample = df["prompt"].sample(min(1000, len(df)), random_state=0)
+    for index, prompt in sample.items():
+        assert counts[index] == iwaprompt.estimate_tokens(prompt), index
+
+    print(f"korpus: {len(df)} satır, toplam ~{counts.sum():,} token")
+    print(f"vektörel sayım: {elapsed:.2f} sn ({len(df) / elapsed:,.0f} satır/sn)")
+    print("örneklem: vektörel ve tekil sayım eşleşiyor")
+
+
+def bench_shards(args):
+    """Parçalı arama: sorgu gecikmesi parça boyutuyla ölçeklenmeli"""
+    df = synthetic_corpus(args.rows)
+    df.attrs["corpus_version"] = 1
+    queries = [("marketing", "Tümü"), ("", "Data Scientist"), ("müşteri", "Copywriter"),
+               ("python", "Tümü"), ("%15", "Tümü"), ("b2b|growth", "Tümü")]
+
+    # filter_prompts ile aynı sonuçlar (sayı ve korpus sırasıyla ilk k)
+    expected = {}
+    for query in queries:
+        filtered = iwaprompt.filter_prompts(df, *query)
+        expected[query] = (len(filtered), list(filtered.index[:iwaprompt.SEARCH_RESULT_LIMIT]))
+
+    print(f"korpus: {args.rows} satır, çekirdek: {os.cpu_count()}")
+    baseline = None
+    for shards in args.shards:
+        start = time.perf_counter()
+        pool = iwaprompt.create_search_shards(df, shards)
+        pool.query("", "Tümü")
+        build = time.perf_counter() - start
+        try:
+            for query in queries:
+                count, _, ids = pool.query(*query)
+                assert (count, list(ids)) == expected[query], query
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for query in queries:
+                    pool.query(*query)
+            latency = (time.perf_counter() - start) / (args.repeat * len(queries))
+        finally:
+            pool.close()
+        baseline = baseline or latency
+        print(f"{shards:>3} parça: kurulum {build:6.2f} sn, sorgu {latency * 1000:8.1f} ms  "
+              f"(x{baseline / latency:.2f})  doğru")
+
+
+def bench_autocomplete(args):
+    """Otomatik tamamlama: tuş vuruşu başına gecikme"""
+    df = synthetic_corpus(args.rows)
+    df.attrs["corpus_version"] = 1
+
+    start = time.perf_counter()
+    index = iwaprompt.build_autocomplete_index(df)
+    build = time.perf_counter() - start
+
+    # Her kelime harf harf yazılır; her önek bir tuş vuruşu
+    words = ["marketing expert", "data scientist 12", "müşteri", "strateji", "python", "sa", "x"]
+    keystrokes = [word[:length] for word in words for length in range(1, len(word) + 1)]
+    latencies = []
+    for _ in range(args.repeat):
+        for prefix in keystrokes:
+            start = time.perf_counter()
+            suggestions = index.suggest(prefix)
+            latencies.append(time.perf_counter() - start)
+            assert all(label.lower().startswith(prefix.strip()) for label, _, _ in suggestions), prefix
+
+    latencies.sort()
+    print(f"korpus: {args.rows} satır, indeks: {len(index.keys):,} anahtar, kurulum {build:.2f} sn")
+    print(f"örnek: 'mark' -> {[label for label, _, _ in index.suggest('mark')]}")
+    print(f"tuş vuruşu: ortalama {sum(latencies) / len(latencies) * 1000:.3f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms, en kötü {latencies[-1] * 1000:.3f} ms")
+
+
+def bench_snippets(args):
+    """Vurgulu kesitler: eşleşme konumları sayfa başına bir kez bulunur, rerun'larda önbellekten gelir"""
+    df = synthetic_corpus(args.rows)
+    df.attrs["corpus_version"] = 1
+    index = iwaprompt.LocalShards(df)
+
+    for term in ["strateji", "Python", "%15", "b2b|growth"]:
+        start = time.perf_counter()
+        count, _, ids = index.query(term, "Tümü", iwaprompt.SEARCH_RESULT_LIMIT)
+        search = time.perf_counter() - start
+
+        # Sayfa başına 5 kart: ilk gösterim konumları bulur, sonraki rerun'lar önbellekten okur
+        pages = [ids[i:i + 5] for i in range(0, min(len(ids), args.cards), 5)]
+        iwaprompt.SEARCH_CACHE.clear()
+        start = time.perf_counter()
+        spans = [iwaprompt.page_match_spans(df, term, "Tümü", page, page_ids)
+                 for page, page_ids in enumerate(pages, 1)]
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for page, page_ids in enumerate(pages, 1):
+                iwaprompt.page_match_spans(df, term, "Tümü", page, page_ids)
+        rerun = (time.perf_counter() - start) / args.repeat
+
+        snippets = [
+            iwaprompt.keyword_snippet(df.at[row, "prompt"].replace('"', '').strip(), *span)
+            for page_ids, page_spans in zip(pages, spans) for row, span in zip(page_ids, page_spans)
+        ]
+        assert len(snippets) == min(count, args.cards)
+        assert all(":orange-background[" in snippet for snippet in snippets), term
+        print(f"'{term}': {count} eşleşme, arama {search * 1000:.1f} ms, {len(pages)} sayfa konum "
+              f"ilk {first * 1000:.3f} ms, rerun {rerun * 1000:.3f} ms")
+
+    # Prompt içindeki Markdown karakterleri vurguyu bozmamalı
+    text = "Use [brackets] and *stars* around: the **key** term_1"
+    snippet = iwaprompt.keyword_snippet(text, *iwaprompt.match_span(text, "key"))
+    assert snippet.count(":orange-background[") == 1 and "\\[brackets\\]" in snippet, snippet
+    assert snippet.count("**") == 2 and "\\*stars\\*" in snippet, snippet
+    print(f"kaçış: {snippet}")
+
+
+def bench_scoring(args):
+    """Puanlama planı: yürütme hızı ve oturumlar puanlarken kural dosyasının yeniden yüklenmesi"""
+    df = synthetic_corpus(args.rows)
+    features = [iwaprompt.compute_segment_features(prompt) for prompt in df["prompt"]]
+    plan = iwaprompt.get_scoring_plan()
+
+    start = time.perf_counter()
+    scores = [plan.score(feature)["score"] for feature in features]
+    elapsed = time.perf_counter() - start
+    print(f"plan v{plan.version}: {len(plan.rules)} kural, {len(features) / elapsed:,.0f} prompt/sn")
+
+    with open(iwaprompt.SCORING_RULES_PATH, encoding="utf-8") as file:
+        rules = json.load(file)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scoring_rules.json")
+
+        def publish(base_score):
+            # Yarım dosya okunmasın diye geçici dosyaya yazıp atomik olarak değiştir
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump({**rules, "base_score": base_score}, file)
+            os.replace(path + ".tmp", path)
+
+        publish(rules["base_score"])
+        iwaprompt.SCORING_RULES_PATH = path
+        iwaprompt.SCORING_RELOAD_INTERVAL = 0
+        prompts = list(df["prompt"][:args.prompts])
+        expected = {prompt: iwaprompt.analyze_prompt_quality(prompt)["score"] for prompt in prompts}
+        stop = threading.Event()
+        seen = []
+
+        def session():
+            # Her puan ya eski ya yeni planla tutarlı olmalı (yarım plan yok)
+            while not stop.is_set():
+                for prompt in prompts:
+                    current = iwaprompt.get_scoring_plan()
+                    score = iwaprompt.analyze_prompt_quality(prompt, current)["score"]
+                    shift = current.base_score - rules["base_score"]
+                    assert score == max(0, min(100, expected[prompt] + shift)), (current.version, prompt)
+                seen.append(current.version)
+
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            futures = [pool.submit(session) for _ in range(args.threads)]
+            first_version = iwaprompt.get_scoring_plan().version
+            start = time.perf_counter()
+            for reload in range(args.reloads):
+                time.sleep(0.05)
+                publish(rules["base_score"] - 10 * ((reload % 2) + 1))
+                while iwaprompt.get_scoring_plan().version == first_version + reload:
+                    time.sleep(0.001)
+            reload_time = (time.perf_counter() - start - 0.05 * args.reloads) / args.reloads
+            stop.set()
+            for future in futures:
+                future.result()
+
+        # Hatalı kural dosyası yayınlanmaz; oturumlar önceki planla devam eder
+        last_version = iwaprompt.get_scoring_plan().version
+        for broken in ({"feature": "has_contxt", "is": True, "score": 5}, {"feature": "word_count", "below": "10"}):
+            with open(path + ".tmp", "w", encoding="utf-8") as file:
+                json.dump({**rules, "rules": rules["rules"] + [broken]}, file)
+            os.replace(path + ".tmp", path)
+            assert iwaprompt.get_scoring_plan().version == last_version, broken
+            iwaprompt.analyze_prompt_quality(prompts[0])
+
+    print(f"{args.reloads} yeniden yükleme, v{first_version} -> v{iwaprompt.get_scoring_plan().version}, "
+          f"yayın başına ~{reload_time * 1000:.1f} ms")
+    print(f"{args.threads} oturum {len(seen)} tur puanladı; tüm puanlar kendi plan sürümüyle tutarlı")
+    print("hatalı kural dosyaları reddedildi, önceki plan korunuyor")
+
+
+# Ana sürümdeki tek geçişli analizörün puanları; puanlama kuralları veya sözlükler
+# değiştiğinde bilinçli olarak güncellenmeli
+GOLDEN_SCORES = [
+    ("Blog yazısı yaz.", 35, "F"),
+    ("Bu veriyi analiz et.", 35, "F"),
+    ("Dijital pazarlama konusunda 800 kelimelik blog yazısı yaz. Hedef kitle: 25-40 yaş girişimciler. "
+     "Ton: bilgilendirici ama samimi. Çıktı formatı: giriş-gelişme-sonuç yapısında, alt başlıklarla.", 65, "B-"),
+    ("Write a 500 word plan for a B2B startup company, for example a SaaS targeting enterprise audience.", 100, "A+"),
+    ("BİR ŞEYLER YAZ GİBİ FALAN FİLAN VS VB BİRAZ ŞEY", 40, "D"),
+    ("bir şeyler biraz gibi falan filan vs vb şey hakkında düşün ve bana anlat lütfen çok güzel olsun", 50, "C-"),
+    ("Act as a Linux terminal. I will type commands and you will reply with what the terminal should show.", 50, "C-"),
+    ("Müşteri profil analizi için python ve sql kullanarak kpi metrics tablosu oluştur, örnek: 3 segment.", 100, "A+"),
+    ("Please help me with my homework about history of the roman empire and its fall in detail " * 30, 40, "D"),
+    ("Sen deneyimli bir iş analisti olarak hareket et.\n\nŞirketimiz için rakip analizi yap.\n"
+     "- Rakipler: A, B\n- Dönem: 2024", 70, "B"),
+    ("x" * 12, 20, "F"),
+    ("   kısa    ", 0, "F"),
+]
+
+
+def bench_equivalence(args):
+    """Analiz yolları (tekil, parçalı, akış) ve token sayımı için rastgele eşdeğerlik denetimi"""
+    for prompt, score, grade in GOLDEN_SCORES:
+        analysis = iwaprompt.analyze_prompt_quality(prompt)
+        assert (analysis["score"], analysis["grade"]) == (score, grade), (prompt, analysis["score"])
+
+    rng = random.Random(args.seed)
+    words = ["için", "target", "örnek", "Example", "yaz", "analiz", "et", "analiz et", "machine learning",
+             "bir şeyler", "bir", "şeyler", "vs", "vb", "gibi", "12", "a.b", ".", "..", "KPI", "İstanbul",
+             "ŞEY", "x", "json", " ", "\n", "\t", "ǅ", "ß", "3.5", ". ", "und", "die", "das",
+             "zum beispiel", "schreibe", "fund", "\x1c", "müşteri profil", "😀", "{", "%15"]
+    separators = ["", " ", "  ", "\n", ".", " . "]
+    texts = []
+    for _ in range(args.texts):
+        text = "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(0, 60)))
+        texts.append(text.upper() if rng.random() < 0.2 else text)
+
+    start = time.perf_counter()
+    for text in texts:
+        iwaprompt.SCORE_CACHE.clear()
+        expected = iwaprompt.analyze_prompt_quality(text)
+        assert iwaprompt.analyze_prompt_quality(text) == expected, repr(text)
+        assert iwaprompt.analyze_prompt_segments(text) == expected, repr(text)
+        step = rng.choice([1, 3, 7, 100])
+        chunks = [text[i:i + step] for i in range(0, len(text), step)]
+        chunk_size = rng.choice([1, 2, 3, 5, 8, 13, 40])
+        assert iwaprompt.analyze_prompt_stream(chunks, chunk_size=chunk_size) == expected, (repr(text), step, chunk_size)
+
+    counts = iwaprompt.estimate_tokens_series(pd.Series(texts))
+    assert counts.tolist() == [iwaprompt.estimate_tokens(text) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(GOLDEN_SCORES)} sabit örnek puanı eşleşiyor")
+    print(f"{len(texts)} rastgele metin: tekil, parçalı, akış ve token yolları eşdeğer ({elapsed:.1f} sn)")
+
+
+def first_interactive(command, port, env):
+    """Sunucuyu başlat; hazır olma süresini ve ilk oturumun betik çalıştırma süresini ölç"""
+    from urllib.request import urlopen
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from websockets.sync.client import connect
+
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        command + ["--server.headless", "true", "--server.port", str(port),
+                   "--server.enableXsrfProtection", "false"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            try:
+                urlopen(f"http://localhost:{port}/_stcore/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.05)
+        ready = time.perf_counter() - start
+
+        # Tarayıcının ilk bağlantısı: betiği çalıştır ve script_finished mesajını bekle
+        start = time.perf_counter()
+        with connect(f"ws://localhost:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+            message = BackMsg()
+            message.rerun_script.query_string = ""
+            ws.send(message.SerializeToString())
+            while True:
+                reply = ForwardMsg()
+                reply.ParseFromString(ws.recv(timeout=600))
+                if reply.WhichOneof("type") == "script_finished":
+                    break
+        return ready, time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def bench_startup(args):
+    """İlk etkileşime kadar geçen süre: streamlit run ile --serve önyükleme kancası"""
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, "corpus.csv")
+        synthetic_corpus(args.rows).to_csv(corpus_path, index=False)
+        sources_path = os.path.join(directory, "sources.json")
+        with open(sources_path, "w", encoding="utf-8") as file:
+            json.dump([{"name": "benchmark", "path": corpus_path}], file)
+
+        print(f"korpus: {args.rows} satır")
+        commands = [
+            ("streamlit run", [sys.executable, "-m", "streamlit", "run", "iwaprompt.py"]),
+            ("--serve", [sys.executable, "iwaprompt.py", "--serve"]),
+        ]
+        for offset, (label, command) in enumerate(commands):
+            env = dict(os.environ, IWAPROMPT_SOURCES=sources_path,
+                       IWAPROMPT_DB=os.path.join(directory, f"users_{offset}.db"))
+            ready, first = first_interactive(command, args.port + offset, env)
+            print(f"{label:<14} sunucu hazır {ready:6.2f} sn, ilk çalıştırma {first:6.2f} sn, "
+                  f"ilk etkileşim {ready + first:6.2f} sn")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IWA Prompt performans ölçümleri")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    templates = commands.add_parser("templates", help="Toplu şablon doldurma")
+    templates.add_argument("--rows", type=int, default=1_000_000)
+    templates.set_defaults(func=bench_templates)
+
+    concurrency = commands.add_parser("concurrency", help="Eşzamanlı oturum stres testi")
+    concurrency.add_argument("--rows", type=int, default=20_000)
+    concurrency.add_argument("--prompts", type=int, default=500)
+    concurrency.add_argument("--ops", type=int, default=50)
+    concurrency.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    concurrency.set_defaults(func=bench_concurrency)
+
+    sources = commands.add_parser("sources", help="Eşzamanlı çok kaynaklı yükleme")
+    sources.add_argument("--rows", type=int, default=1000)
+    sources.add_argument("--delays", type=float, nargs="+", default=[0.5, 0.8, 1.0, 1.5])
+    sources.set_defaults(func=bench_sources)
+
+    tokens = commands.add_parser("tokens", help="Korpus token sayımı")
+    tokens.add_argument("--rows", type=int, default=1_000_000)
+    tokens.set_defaults(func=bench_tokens)
+
+    shards = commands.add_parser("shards", help="Parçalı arama ve sorgu dağıtımı")
+    shards.add_argument("--rows", type=int, default=1_000_000)
+    shards.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    shards.add_argument("--repeat", type=int, default=3)
+    shards.set_defaults(func=bench_shards)
+
+    autocomplete = commands.add_parser("autocomplete", help="Otomatik tamamlama gecikmesi")
+    autocomplete.add_argument("--rows", type=int, default=100_000)
+    autocomplete.add_argument("--repeat", type=int, default=20)
+    autocomplete.set_defaults(func=bench_autocomplete)
+
+    snippets = commands.add_parser("snippets", help="Vurgulu sonuç kesitleri")
+    snippets.add_argument("--rows", type=int, default=100_000)
+    snippets.add_argument("--cards", type=int, default=50)
+    snippets.add_argument("--repeat", type=int, default=100)
+    snippets.set_defaults(func=bench_snippets)
+
+    scoring = commands.add_parser("scoring", help="Puanlama planı ve sıcak yeniden yükleme")
+    scoring.add_argument("--rows", type=int, default=20_000)
+    scoring.add_argument("--prompts", type=int, default=200)
+    scoring.add_argument("--threads", type=int, default=4)
+    scoring.add_argument("--reloads", type=int, default=20)
+    scoring.set_defaults(func=bench_scoring)
+
+    equivalence = commands.add_parser("equivalence", help="Analiz yollarının eşdeğerlik denetimi")
+    equivalence.add_argument("--texts", type=int, default=20_000)
+    equivalence.add_argument("--seed", type=int, default=2)
+    equivalence.set_defaults(func=bench_equivalence)
+
+    startup = commands.add_parser("startup", help="İlk etkileşime kadar geçen süre")
+    startup.add_argument("--rows", type=int, default=5000)
+    startup.add_argument("--port", type=int, default=8650)
+    startup.set_defaults(func=bench_startup)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,47 @@
 import streamlit as st
 try:
     import pandas as pd
+    import numpy as np
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     import io
     from datetime import datetime
     import re
     import json
+    import functools
+    import csv
+    import os
+    import sys
+    import time
+    import cProfile
+    import string
+    import tempfile
+    import sqlite3
+    import uuid
+    import hashlib
+    import hmac
+    import logging
+    import atexit
+    from collections import OrderedDict
+    import threading
+    import bisect
+    import multiprocessing
+    import itertools
+    from concurrent.futures import Future, ThreadPoolExecutor, wait
+    from iwaprompt_shards import REGEX_SPECIAL, ShardIndex, merge_shard_results, shard_worker
 except ImportError as e:
     st.error(f"Required packages not installed: {e}")
     st.stop()
 
+# İsteğe bağlı: vektörel token sayımı için (pandas ile birlikte gelir)
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+LOGGER = logging.getLogger("iwaprompt")
+
 # Sayfa yapılandırması
 st.set_page_config(
     page_title="🤖 AI Prompt Koleksiyonu - IWA Concept",
@@ -18,30 +50,650 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-@st.cache_data(ttl=3600)  # 1 saat cache
+# Eşzamanlılık katmanı: Streamlit her oturumu ayrı bir iş parçacığında çalıştırır,
+# bu yüzden süreç genelinde paylaşılan yapılar aşağıdaki yardımcılarla korunur.
+class Snapshot:
+    """Okuma ağırlıklı paylaşılan değer; yeni değer atomik referans değişimiyle yayınlanır"""
+
+    def __init__(self, value=None):
+        self._value = value
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        return self._value
+
+    @property
+    def version(self):
+        return self._version
+
+    def replace(self, value):
+        with self._lock:
+            self._version += 1
+            self._value = value
+            return self._version
+
+class StripedCache:
+    """Kilit şeritlemeli LRU önbellek; farklı şeritlerdeki anahtarlar birbirini beklemez"""
+
+    def __init__(self, maxsize=4096, stripes=16):
+        self._stripes = [OrderedDict() for _ in range(stripes)]
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stripe_size = max(1, maxsize // stripes)
+
+    def _stripe(self, key):
+        index = hash(key) % len(self._stripes)
+        return self._stripes[index], self._locks[index]
+
+    def get(self, key, default=None):
+        entries, lock = self._stripe(key)
+        with lock:
+            if key not in entries:
+                return default
+            entries.move_to_end(key)
+            return entries[key]
+
+    def put(self, key, value):
+        entries, lock = self._stripe(key)
+        with lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            if len(entries) > self._stripe_size:
+                entries.popitem(last=False)
+
+    def clear(self):
+        for entries, lock in zip(self._stripes, self._locks):
+            with lock:
+                entries.clear()
+
+class SingleFlight:
+    """Aynı anahtar için eşzamanlı kurulumları tek çağrıya indirir"""
+
+    def __init__(self):
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def do(self, key, builder, is_fresh=None):
+        """Anahtar için kilidi al; başka iş parçacığı az önce kurduysa is_fresh ile atla"""
+        with self._guard:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            if is_fresh is not None:
+                fresh = is_fresh()
+                if fresh is not None:
+                    return fresh
+            return builder()
+
+class QualityStats:
+    """Süreç genelinde kalite analizi istatistikleri"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0
+        self.best = 0
+
+    def record(self, score):
+        with self._lock:
+            self.count += 1
+            self.total += score
+            self.best = max(self.best, score)
+
+    def summary(self):
+        with self._lock:
+            average = self.total / self.count if self.count else 0
+            return self.count, self.best, average
+
+@st.cache_resource(show_spinner=False)
+def _process_objects():
+    """Süreç genelinde yaşayan nesnelerin kaydı (betiğin yeniden çalıştırılmasından etkilenmez)"""
+    return {"lock": threading.Lock(), "objects": {}}
+
+def shared(name, factory):
+    """Streamlit betiği her çalıştırmada baştan yürütür; paylaşılan yapı süreç başına bir kez oluşturulur"""
+    registry = _process_objects()
+    with registry["lock"]:
+        if name not in registry["objects"]:
+            registry["objects"][name] = factory()
+        return registry["objects"][name]
+
+QUALITY_STATS = shared("quality_stats", QualityStats)
+
+# Prompt kaynakları: data/sources.json (veya IWAPROMPT_SOURCES ile verilen dosya)
+SOURCES_PATH = os.environ.get(
+    "IWAPROMPT_SOURCES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sources.json")
+)
+DEFAULT_SOURCES = [{
+    "name": "awesome-chatgpt-prompts",
+    "url": "https://raw.githubusercontent.com/f/awesome-chatgpt-prompts/main/prompts.csv"
+}]
+SOURCE_TIMEOUT = 30
+SOURCE_RETRIES = 3
+SOURCE_BACKOFF = 0.5
+SOURCE_MAX_WORKERS = 8
+
+def get_prompt_sources(path=SOURCES_PATH):
+    """Kaynak kaydını oku; dosya yoksa varsayılan GitHub kaynağını kullan"""
+    if not os.path.exists(path):
+        return DEFAULT_SOURCES
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+def create_http_session(pool_size=SOURCE_MAX_WORKERS):
+    """Bağlantı havuzlu, gzip destekli ve geri çekilmeli yeniden denemeli oturum"""
+    retry = Retry(
+        total=SOURCE_RETRIES,
+        backoff_factor=SOURCE_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({
+        'User-Agent': 'IWA-Concept-Streamlit-App',
+        'Accept-Encoding': 'gzip, deflate'
+    })
+    return session
+
+def fetch_source(session, source):
+    """Tek bir kaynağı indir/oku ve act, prompt, source şemasına dönüştür"""
+    if "url" in source:
+        response = session.get(source["url"], timeout=SOURCE_TIMEOUT)
+        response.raise_for_status()
+        # charset'siz text/csv yanıtlarında requests ISO-8859-1 varsayar; baytları kendimiz çözeriz
+        df = pd.read_csv(io.BytesIO(response.content), encoding=source.get("encoding", "utf-8"))
+    else:
+        path = source["path"]
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+        df = pd.read_csv(path, encoding=source.get("encoding", "utf-8"))
+    
+    df = df.rename(columns=source.get("columns", {}))
+    
+    # Veri doğrulama
+    if df.empty or 'act' not in df.columns or 'prompt' not in df.columns:
+        raise ValueError("CSV formatı beklenen yapıda değil")
+    
+    df = df[['act', 'prompt']].dropna(subset=['prompt'])
+    df['source'] = source["name"]
+    return df
+
+def load_prompt_sources(sources, max_workers=SOURCE_MAX_WORKERS):
+    """Tüm kaynakları eşzamanlı yükle ve tek tabloda birleştir; (df, hatalar) döndür"""
+    errors = {}
+    frames = []
+    with create_http_session(pool_size=max_workers) as session:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="iwaprompt-source") as pool:
+            futures = [(source["name"], pool.submit(fetch_source, session, source)) for source in sources]
+            for name, future in futures:
+                try:
+                    frames.append(future.result())
+                except Exception as e:
+                    errors[name] = e
+    
+    if not frames:
+        return None, errors
+    
+    df = pd.concat(frames, ignore_index=True)
+    df = df.drop_duplicates(subset=['act', 'prompt'], keep='first').reset_index(drop=True)
+    return df, errors
+
 def load_prompts():
-    """GitHub'dan prompts.csv dosyasını yükle"""
+    """Kayıtlı tüm kaynaklardan prompt'ları yükle; (df, kaynak hata mesajları) döndür"""
     try:
-        url = "https://raw.githubusercontent.com/f/awesome-chatgpt-prompts/main/prompts.csv"
-        headers = {'User-Agent': 'IWA-Concept-Streamlit-App'}
-        response = requests.get(url, headers=headers, timeout=30)
-        response.raise_for_status()
-        
-        csv_content = io.StringIO(response.text)
-        df = pd.read_csv(csv_content)
-        
-        # Veri doğrulama
-        if df.empty or 'act' not in df.columns or 'prompt' not in df.columns:
-            raise ValueError("CSV formatı beklenen yapıda değil")
-        
-        return df
-    except requests.exceptions.RequestException as e:
-        st.error(f"GitHub'dan veri çekilirken hata: {e}")
-        st.info("💡 İnternet bağlantınızı kontrol edin veya sayfayı yenileyin")
-        return None
+        df, errors = load_prompt_sources(get_prompt_sources())
     except Exception as e:
-        st.error(f"Beklenmeyen hata: {e}")
-        return None
+        return None, [f"Beklenmeyen hata: {e}"]
+    
+    messages = []
+    for name, error in errors.items():
+        if isinstance(error, requests.exceptions.RequestException):
+            messages.append(f"'{name}' kaynağından veri çekilirken hata: {error}")
+        else:
+            messages.append(f"'{name}' kaynağı okunurken hata: {error}")
+    return df, messages
+
+# Paylaşılan korpus: tüm oturumlar aynı DataFrame'i okur (salt okunur kullanılmalı).
+# Süresi dolan korpus arka planda yenilenirken okuyucular eski sürümü almaya devam eder.
+CORPUS_TTL = 3600
+CORPUS_RETRY_INTERVAL = 300
+CORPUS = shared("corpus", Snapshot)
+CORPUS_BUILDS = shared("corpus_builds", SingleFlight)
+# errors: son yüklemenin kaynak hataları; yükleme iş parçacığında toplanır, main() gösterir
+CORPUS_REFRESH = shared(
+    "corpus_refresh",
+    lambda: {"lock": threading.Lock(), "running": False, "failed_at": None, "errors": []}
+)
+
+def _reload_corpus():
+    """Korpusu yeniden yükle ve yeni sürüm olarak yayınla"""
+    df, errors = load_prompts()
+    CORPUS_REFRESH["errors"] = errors
+    if df is None:
+        # Yükleme başarısızsa eski korpusla devam et; yeniden deneme CORPUS_RETRY_INTERVAL sonra
+        CORPUS_REFRESH["failed_at"] = time.monotonic()
+        return CORPUS.get()
+    CORPUS_REFRESH["failed_at"] = None
+    df.attrs["loaded_at"] = time.monotonic()
+    df.attrs["corpus_version"] = CORPUS.version + 1
+    CORPUS.replace(df)
+    return df
+
+def _corpus_reload_due(current):
+    """Korpus yok veya süresi dolmuşsa ve son başarısız denemeden beri yeterli süre geçmişse True"""
+    failed_at = CORPUS_REFRESH["failed_at"]
+    if failed_at is not None and time.monotonic() - failed_at < CORPUS_RETRY_INTERVAL:
+        return False
+    return current is None or time.monotonic() - current.attrs["loaded_at"] >= CORPUS_TTL
+
+def _load_first_corpus():
+    """İlk yükleme: bekleyen oturumlar tek indirmeyi paylaşır"""
+    current = CORPUS.get()
+    if current is not None or not _corpus_reload_due(None):
+        return current
+    return _reload_corpus()
+
+def _refresh_corpus():
+    """Arka plan yenilemesi; bitince yeni yenilemelere izin ver"""
+    try:
+        CORPUS_BUILDS.do("corpus", _reload_corpus)
+    finally:
+        with CORPUS_REFRESH["lock"]:
+            CORPUS_REFRESH["running"] = False
+
+def get_corpus():
+    """Paylaşılan korpusu döndür; süresi dolduysa eskisini döndürüp arka planda yenile"""
+    current = CORPUS.get()
+    if current is None:
+        return CORPUS_BUILDS.do("corpus", _load_first_corpus)
+    
+    if _corpus_reload_due(current):
+        with CORPUS_REFRESH["lock"]:
+            start = not CORPUS_REFRESH["running"]
+            CORPUS_REFRESH["running"] = True
+        if start:
+            threading.Thread(target=_refresh_corpus, name="iwaprompt-corpus-refresh", daemon=True).start()
+    return current
+
+def corpus_key(df):
+    """Korpusa bağlı önbellekler için sürüm anahtarı"""
+    return df.attrs.get("corpus_version", id(df))
+
+# Kullanıcı verileri: favoriler, son aramalar ve analiz geçmişi (SQLite)
+USER_DB_PATH = os.environ.get(
+    "IWAPROMPT_DB",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "iwaprompt.db")
+)
+HISTORY_LIMIT = 10
+HISTORY_TEXT_LIMIT = 2000
+WRITE_BATCH_SIZE = 50
+WRITE_FLUSH_INTERVAL = 2.0
+
+class UserStore:
+    """Kullanıcı başına favori ve geçmiş deposu; yazmalar toplu halde işlenir"""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS favorites (
+            user_id TEXT NOT NULL,
+            act TEXT NOT NULL,
+            prompt TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (user_id, act, prompt)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            text TEXT NOT NULL,
+            score INTEGER,
+            grade TEXT,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS history_user_kind_time
+            ON history (user_id, kind, created_at DESC);
+    """
+
+    def __init__(self, path=USER_DB_PATH):
+        self._lock = threading.Lock()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(self.SCHEMA)
+        # Zamanlayıcı: aralıkta başka yazma/okuma gelmese de bekleyen yazmalar en geç
+        # WRITE_FLUSH_INTERVAL sonra diske iner
+        threading.Thread(target=self._flush_periodically, name="iwaprompt-user-store", daemon=True).start()
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(WRITE_FLUSH_INTERVAL)
+            with self._lock:
+                if self._pending and time.monotonic() - self._last_flush >= WRITE_FLUSH_INTERVAL:
+                    self._flush_locked()
+
+    def _queue(self, sql, params):
+        with self._lock:
+            self._pending.append((sql, params))
+            due = (
+                len(self._pending) >= WRITE_BATCH_SIZE
+                or time.monotonic() - self._last_flush >= WRITE_FLUSH_INTERVAL
+            )
+            if due:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                with self._connection:
+                    for sql, params in batch:
+                        self._connection.execute(sql, params)
+            except sqlite3.Error as e:
+                # Başarısız toplu yazma (ör. "database is locked") düşürülür; sonraki isteklerde
+                # yeniden denenip her oturumun okumasını bozmaz
+                LOGGER.warning("Kullanıcı verisi yazılamadı, %d işlem düşürüldü: %s", len(batch), e)
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _query(self, sql, params):
+        # Okumadan önce bekleyen yazmalar işlenir (kendi yazdığını okuma)
+        with self._lock:
+            self._flush_locked()
+            return self._connection.execute(sql, params).fetchall()
+
+    def add_favorite(self, user_id, act, prompt):
+        self._queue(
+            "INSERT OR IGNORE INTO favorites (user_id, act, prompt, created_at) VALUES (?, ?, ?, ?)",
+            (user_id, act, prompt, time.time())
+        )
+
+    def remove_favorite(self, user_id, act, prompt):
+        self._queue(
+            "DELETE FROM favorites WHERE user_id = ? AND act = ? AND prompt = ?",
+            (user_id, act, prompt)
+        )
+
+    def favorites(self, user_id):
+        return self._query(
+            "SELECT act, prompt FROM favorites WHERE user_id = ? ORDER BY created_at DESC",
+            (user_id,)
+        )
+
+    def add_history(self, user_id, kind, text, score=None, grade=None):
+        self._queue(
+            "INSERT INTO history (user_id, kind, text, score, grade, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (user_id, kind, text, score, grade, time.time())
+        )
+
+    def history(self, user_id, kind, limit=HISTORY_LIMIT):
+        return self._query(
+            "SELECT text, score, grade, created_at FROM history"
+            " WHERE user_id = ? AND kind = ? ORDER BY created_at DESC LIMIT ?",
+            (user_id, kind, limit)
+        )
+
+@st.cache_resource(show_spinner=False)
+def get_user_store():
+    """Süreç genelinde tek kullanıcı deposu"""
+    store = UserStore()
+    atexit.register(store.flush)
+    return store
+
+USER_COOKIE = "iwaprompt_uid"
+USER_COOKIE_MAX_AGE = 365 * 24 * 3600
+
+def get_user_id():
+    """Kullanıcı kimliği: oturum açılmışsa st.user, değilse tarayıcı çerezindeki anonim kimlik.
+
+    Kimlik URL'ye yazılmaz; paylaşılan bağlantılar başkasının favorilerini açmaz. Anonim çerez
+    yalnızca bu tarayıcıyı tanır (kimlik doğrulaması değildir); çerezi silen kullanıcı verisine
+    yeni kimlikle ulaşamaz. Kalıcı ve güvenli kimlik için Streamlit kimlik doğrulaması (st.login)
+    yapılandırılmalıdır.
+    """
+    if st.user.get("is_logged_in"):
+        subject = st.user.get("sub") or st.user.get("email")
+        return "user:" + hashlib.sha256(str(subject).encode("utf-8")).hexdigest()
+    
+    # Eski sürümlerin URL'ye yazdığı kimlik artık kabul edilmez
+    if "uid" in st.query_params:
+        del st.query_params["uid"]
+    
+    user_id = st.context.cookies.get(USER_COOKIE)
+    if not isinstance(user_id, str) or not re.fullmatch(r"[0-9a-f]{32}", user_id):
+        user_id = st.session_state.setdefault("anonymous_user_id", uuid.uuid4().hex)
+        # Streamlit çerez yazma API'si sunmaz; görünmez bileşen çerezi tarayıcıda ayarlar
+        st.iframe(
+            f"<script>document.cookie = '{USER_COOKIE}={user_id}; path=/; "
+            f"max-age={USER_COOKIE_MAX_AGE}; SameSite=Strict';</script>",
+            height=1
+        )
+    return user_id
+
+def load_user_data():
+    """Oturum başında kullanıcının favori ve geçmişini bir kez yükle"""
+    if 'user_data' not in st.session_state:
+        store = get_user_store()
+        user_id = get_user_id()
+        st.session_state['user_data'] = {
+            "user_id": user_id,
+            "favorites": [tuple(row) for row in store.favorites(user_id)],
+            "searches": [row[0] for row in store.history(user_id, "search")],
+            "analyses": [tuple(row) for row in store.history(user_id, "analysis")]
+        }
+    return st.session_state['user_data']
+
+def toggle_favorite(act, prompt):
+    """Prompt'u favorilere ekle veya çıkar"""
+    user_data = load_user_data()
+    store = get_user_store()
+    if (act, prompt) in user_data["favorites"]:
+        user_data["favorites"].remove((act, prompt))
+        store.remove_favorite(user_data["user_id"], act, prompt)
+    else:
+        user_data["favorites"].insert(0, (act, prompt))
+        store.add_favorite(user_data["user_id"], act, prompt)
+
+def record_search(search_term):
+    """Son aramalara ekle (art arda aynı arama tekrar kaydedilmez)"""
+    user_data = load_user_data()
+    if not search_term or (user_data["searches"] and user_data["searches"][0] == search_term):
+        return
+    user_data["searches"] = [search_term] + [term for term in user_data["searches"] if term != search_term][:HISTORY_LIMIT - 1]
+    get_user_store().add_history(user_data["user_id"], "search", search_term)
+
+def record_analysis(prompt_text, analysis):
+    """Analiz geçmişine ekle"""
+    user_data = load_user_data()
+    # Çok büyük belgeler geçmişte kısaltılmış olarak saklanır
+    prompt_text = prompt_text[:HISTORY_TEXT_LIMIT]
+    entry = (prompt_text, analysis["score"], analysis["grade"], time.time())
+    user_data["analyses"] = [entry] + user_data["analyses"][:HISTORY_LIMIT - 1]
+    get_user_store().add_history(
+        user_data["user_id"], "analysis", prompt_text, analysis["score"], analysis["grade"]
+    )
+
+def use_search_term(search_term):
+    """Son aramalardan veya önerilerden birini arama kutusuna yerleştir"""
+    st.session_state['search_term'] = search_term
+
+# Sekme widget'ları: yalnızca açık sekme çizildiğinden kapalı sekmedeki widget durumu silinir;
+# değer kalıcı bir anahtarda tutulur ve widget her çizimde oradan tohumlanır
+def persistent_widget(key, in_form=False):
+    """Kalıcı anahtar için widget argümanları (form içinde değer gönderimde kaydedilir)"""
+    widget_key = f"{key}__widget"
+    if key in st.session_state:
+        st.session_state[widget_key] = st.session_state[key]
+    if in_form:
+        return {"key": widget_key}
+    return {"key": widget_key, "on_change": store_widget_values, "args": ([key],)}
+
+def store_widget_values(keys):
+    """Widget değerlerini kalıcı anahtarlarına kopyala"""
+    for key in keys:
+        st.session_state[key] = st.session_state[f"{key}__widget"]
+
+# Profil çıkarma: IWAPROMPT_PROFILE=1 ile her rerun, ?profile=<IWAPROMPT_PROFILE_TOKEN> ile
+# yalnızca operatörün açtığı oturum profillenir; dizinde en fazla PROFILE_MAX_FILES dosya tutulur
+PROFILE_DIR = os.environ.get("IWAPROMPT_PROFILE_DIR", "profiles")
+PROFILE_TOKEN = os.environ.get("IWAPROMPT_PROFILE_TOKEN", "")
+PROFILE_MAX_FILES = int(os.environ.get("IWAPROMPT_PROFILE_MAX_FILES", "50"))
+
+def profiling_requested():
+    """Bu rerun için profil istenip istenmediğini kontrol et"""
+    if os.environ.get("IWAPROMPT_PROFILE") == "1":
+        return True
+    # Sorgu parametresi yalnızca operatör bir jeton tanımladıysa ve eşleşiyorsa geçerlidir
+    requested = st.query_params.get("profile")
+    return bool(PROFILE_TOKEN) and isinstance(requested, str) and hmac.compare_digest(
+        requested.encode("utf-8"), PROFILE_TOKEN.encode("utf-8")
+    )
+
+def profile_label():
+    """Profil dosyası için aktif sekme, arama uzunluğu ve sonuç sayısı etiketi"""
+    tab = TAB_IDS.get(st.session_state.get('active_tab'), 'library')
+    search_length = len(st.session_state.get('search_term') or "")
+    result_count = st.session_state.get('result_count', 0)
+    return f"{tab}_q{search_length}_n{result_count}"
+
+_PROFILING = threading.local()
+
+def run_profiled(func):
+    """Fonksiyonu cProfile altında çalıştır ve .pstats dosyası yaz"""
+    # İç içe çağrıda (tam rerun içindeki fragment) dıştaki profil zaten ölçüyor
+    if getattr(_PROFILING, "active", False):
+        return func()
+    profiler = cProfile.Profile()
+    _PROFILING.active = True
+    profiler.enable()
+    try:
+        return func()
+    finally:
+        profiler.disable()
+        _PROFILING.active = False
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        file_name = f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{profile_label()}.pstats"
+        profiler.dump_stats(os.path.join(PROFILE_DIR, file_name))
+        rotate_profiles()
+
+PROFILE_ROTATION_LOCK = shared("profile_rotation_lock", threading.Lock)
+
+def rotate_profiles(directory=PROFILE_DIR, max_files=PROFILE_MAX_FILES):
+    """En yeni max_files profil dosyasını tut, eskileri sil (dosya adları zaman damgasıyla başlar)"""
+    with PROFILE_ROTATION_LOCK:
+        files = sorted(name for name in os.listdir(directory) if name.endswith(".pstats"))
+        for name in files[:max(0, len(files) - max_files)]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass
+
+def profiled_fragment(func):
+    """Fragment yeniden çalıştırmaları main'i atlar; profil istenmişse fragment gövdesi ayrıca profillenir"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if profiling_requested():
+            return run_profiled(functools.partial(func, *args, **kwargs))
+        return func(*args, **kwargs)
+    return st.fragment(wrapper)
+
+# Isınma (warm-up): paylaşılan yapıları ilk istekten önce hazırla
+WARM_UP_TASKS = {}
+
+def warm_up_task(name, needs_corpus=True):
+    """Isınma sırasında çalışacak bir hazırlık görevini kaydet"""
+    def decorator(func):
+        WARM_UP_TASKS[name] = (func, needs_corpus)
+        return func
+    return decorator
+
+class WarmUpState:
+    """Isınma görevlerinin durumu ve süreleri"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings = {}
+        self.errors = {}
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+        self._done = threading.Event()
+
+    def record(self, name, seconds, error=None):
+        with self._lock:
+            self.timings[name] = seconds
+            if error is not None:
+                self.errors[name] = str(error)
+
+    def finish(self):
+        self.finished_at = time.perf_counter()
+        self._done.set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    @property
+    def ready(self):
+        return self._done.is_set()
+
+    @property
+    def elapsed(self):
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+def run_warm_up(state=None, max_workers=4):
+    """Korpusu ve türetilmiş yapıları paralel iş parçacıklarında hazırla"""
+    state = state or WarmUpState()
+
+    def timed(name, func, *args):
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+        except Exception as e:
+            state.record(name, time.perf_counter() - start, error=e)
+            return None
+        state.record(name, time.perf_counter() - start)
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="iwaprompt-warmup") as pool:
+        corpus = pool.submit(timed, "corpus", get_corpus)
+        futures = [
+            pool.submit(timed, name, func)
+            for name, (func, needs_corpus) in WARM_UP_TASKS.items() if not needs_corpus
+        ]
+        df = corpus.result()
+        if df is not None:
+            futures += [
+                pool.submit(timed, name, func, df)
+                for name, (func, needs_corpus) in WARM_UP_TASKS.items() if needs_corpus
+            ]
+        else:
+            state.record("corpus", state.timings.get("corpus", 0.0), error="Korpus yüklenemedi")
+        wait(futures)
+
+    state.finish()
+    return state
+
+@st.cache_resource(show_spinner=False)
+def start_warm_up():
+    """Sunucu süreci başına bir kez arka planda ısınmayı başlat"""
+    state = WarmUpState()
+    threading.Thread(target=run_warm_up, args=(state,), name="iwaprompt-warmup", daemon=True).start()
+    return state
+
+def print_warm_up_report(state):
+    """Isınma sonuçlarını komut satırına yazdır"""
+    sequential = sum(state.timings.values())
+    for name, seconds in sorted(state.timings.items(), key=lambda item: -item[1]):
+        status = f"HATA: {state.errors[name]}" if name in state.errors else "hazır"
+        print(f"{name:<24} {seconds * 1000:>9.1f} ms  {status}")
+    print(f"{'toplam (sıralı)':<24} {sequential * 1000:>9.1f} ms")
+    print(f"{'toplam (paralel)':<24} {state.elapsed * 1000:>9.1f} ms")
 
 def get_prompt_tips(role_name):
     """Her rol için özel ipuçları"""
@@ -98,183 +750,655 @@ def get_prompt_tips(role_name):
         "example": "Bu role özel örnek henüz eklenmedi."
     })
 
-def analyze_prompt_quality(prompt_text):
-    """Prompt kalitesini analiz et ve puanlama yap"""
-    if not prompt_text or len(prompt_text.strip()) < 10:
-        return {
-            "score": 0,
-            "grade": "F",
-            "issues": ["Prompt çok kısa veya boş"],
-            "suggestions": ["En az 20-30 kelimelik açıklayıcı bir prompt yazın"],
-            "strengths": [],
-            "detailed_analysis": {}
-        }
-    
-    issues = []
-    suggestions = []
-    strengths = []
-    score = 100
-    
-    # Detaylı analiz metrikleri
-    detailed_analysis = {
-        "length": len(prompt_text),
-        "word_count": len(prompt_text.split()),
-        "sentence_count": len([s for s in prompt_text.split('.') if s.strip()]),
-        "has_context": False,
-        "has_examples": False,
-        "has_constraints": False,
-        "has_format_specs": False,
-        "clarity_score": 0,
-        "specificity_score": 0
+# Kalite göstergeleri: dil paketleri halinde, küçük harfli metinde alt dize olarak aranır.
+# "detect" deseni metinde en az "min_hits" kez geçmezse paket atlanır; tr/en için
+# bu, paketin hiçbir göstergesinin eşleşemeyeceği durumdur.
+LEXICON_PACKS = {
+    "tr": {
+        "detect": r'[a-z]',
+        "min_hits": 1,
+        "vague": ['şey', 'bir şeyler', 'biraz', 'gibi', 'falan', 'filan', 'vs', 'vb'],
+        "context": ['için', 'amacıyla', 'hedefi', 'sektör', 'şirket', 'proje', 'müşteri', 'kullanıcı'],
+        "examples": ['örnek', 'mesela', 'gibi', 'örnektir'],
+        "constraints": ['kelime', 'karakter', 'paragraf', 'madde', 'liste', 'tablo', 'format'],
+        "action": [
+            'yaz', 'oluştur', 'analiz et', 'öner', 'listele', 'karşılaştır', 
+            'değerlendir', 'hesapla', 'tasarla', 'planla'
+        ],
+        "technical": ['kod', 'algoritma'],
+        "audience": ['yaş', 'müşteri profil']
+    },
+    "en": {
+        "detect": r'[a-z]',
+        "min_hits": 1,
+        "vague": [],
+        "context": ['target', 'audience', 'company', 'business'],
+        "examples": ['example', 'sample'],
+        "constraints": ['word', 'character', 'bullet', 'number', 'json', 'csv', 'markdown'],
+        "action": ['write', 'create', 'analyze', 'compare', 'evaluate', 'design', 'plan'],
+        "technical": [
+            'api', 'database', 'sql', 'python', 'javascript',
+            'machine learning', 'data science', 'analytics', 'metrics', 'kpi'
+        ],
+        "audience": [
+            'demographic', 'target', 'audience', 'user persona',
+            'segment', 'market', 'b2b', 'b2c', 'enterprise', 'startup'
+        ]
+    },
+    "de": {
+        # En az iki Almanca bağlaç/artikel veya ß: İngilizce/Türkçe metinler yanlışlıkla seçilmez
+        "detect": r'ß|\b(?:und|der|die|das|ist|nicht|für|eine?)\b',
+        "min_hits": 2,
+        "vague": ['irgendwie', 'irgendwas', 'ungefähr', 'usw'],
+        "context": ['zweck', 'unternehmen', 'projekt', 'kunde', 'nutzer'],
+        "examples": ['beispiel', 'zum beispiel'],
+        "constraints": ['wörter', 'zeichen', 'absatz', 'aufzählung', 'tabelle', 'liste'],
+        "action": ['schreibe', 'erstelle', 'analysiere', 'vergleiche', 'bewerte', 'entwirf', 'plane'],
+        "technical": ['algorithmus', 'datenbank', 'quellcode'],
+        "audience": ['zielgruppe', 'altersgruppe', 'kundenprofil']
     }
-    
-    # 1. Uzunluk analizi
-    word_count = len(prompt_text.split())
-    if word_count < 10:
-        score -= 30
-        issues.append("Prompt çok kısa")
-        suggestions.append("Daha detaylı ve açıklayıcı olun (en az 10-15 kelime)")
-    elif word_count > 200:
-        score -= 10
-        issues.append("Prompt çok uzun olabilir")
-        suggestions.append("Ana noktaları özetleyerek daha kısa yapın")
-    else:
-        strengths.append("Uygun uzunlukta")
-    
-    # 2. Netlik ve spesifiklik
-    vague_words = ['şey', 'bir şeyler', 'biraz', 'gibi', 'falan', 'filan', 'vs', 'vb']
-    vague_count = sum(1 for word in vague_words if word in prompt_text.lower())
-    if vague_count > 2:
-        score -= 15
-        issues.append("Belirsiz ifadeler kullanılmış")
-        suggestions.append("Belirsiz kelimeleri spesifik terimlerle değiştirin")
-    
-    # 3. Bağlam kontrolü (Context)
-    context_indicators = [
-        'için', 'amacıyla', 'hedefi', 'sektör', 'şirket', 'proje', 'müşteri', 
-        'kullanıcı', 'target', 'audience', 'company', 'business'
-    ]
-    has_context = any(indicator in prompt_text.lower() for indicator in context_indicators)
-    detailed_analysis["has_context"] = has_context
-    if has_context:
-        strengths.append("Bağlam bilgisi mevcut")
-        detailed_analysis["clarity_score"] += 25
-    else:
-        score -= 20
-        issues.append("Bağlam eksik")
-        suggestions.append("Kimler için, hangi amaçla kullanılacağını belirtin")
-    
-    # 4. Örnek kontrolü
-    example_indicators = ['örnek', 'example', 'mesela', 'gibi', 'örnektir', 'sample']
-    has_examples = any(indicator in prompt_text.lower() for indicator in example_indicators)
-    detailed_analysis["has_examples"] = has_examples
-    if has_examples:
-        strengths.append("Örnekler içeriyor")
-        detailed_analysis["clarity_score"] += 25
+}
+LEXICON_CATEGORIES = ["context", "examples", "constraints", "action", "technical", "audience"]
+
+def compile_lexicon(language):
+    """Dil paketini derle: kategori başına tek alternasyon deseni"""
+    pack = LEXICON_PACKS[language]
+    compiled = {
+        "detect": re.compile(pack["detect"]),
+        "min_hits": pack["min_hits"],
+        "vague": tuple(pack["vague"])
+    }
+    for category in LEXICON_CATEGORIES:
+        words = pack[category]
+        compiled[category] = re.compile("|".join(map(re.escape, words))) if words else None
+    return compiled
+
+# Betik her rerun'da yeniden yürütüldüğünden önbellek shared() ile süreç başına bir kez kurulur
+compiled_lexicon = shared("compiled_lexicon", lambda: functools.lru_cache(maxsize=None)(compile_lexicon))
+
+def language_hits(lower_text, language, limit=None, start=0, end=None):
+    """Dil paketinin algılama deseninin [start, end) aralığında başlayan eşleşme sayısı"""
+    pack = compiled_lexicon(language)
+    end = len(lower_text) if end is None else end
+    hits = 0
+    for match in pack["detect"].finditer(lower_text):
+        if match.start() >= end:
+            break
+        if match.start() >= start:
+            hits += 1
+            if limit is not None and hits >= limit:
+                break
+    return hits
+
+def detect_languages(lower_text):
+    """Küçük harfli metne uygulanabilecek dil paketlerini seç"""
+    return tuple(
+        language for language in LEXICON_PACKS
+        if language_hits(lower_text, language, limit=compiled_lexicon(language)["min_hits"])
+        >= compiled_lexicon(language)["min_hits"]
+    )
+
+# Parçalar arasında eşleşme kaçırmamak için gereken bağlam uzunluğu
+LEXICON_WINDOW = 1 + max(
+    len(word)
+    for pack in LEXICON_PACKS.values()
+    for category in ["vague"] + LEXICON_CATEGORIES
+    for word in pack[category]
+)
+
+# Parça sınırları: satır sonu veya nokta + boşluk sonrası. Hiçbir gösterge
+# bu sınırları aşmadığı için parça özellikleri birleştirildiğinde tüm metnin
+# analiziyle birebir aynı sonucu verir.
+SEGMENT_BOUNDARY = re.compile(r'(?<=\n)|(?<=\.\s)')
+SEGMENT_CACHE_SIZE = 4096
+
+def split_segments(prompt_text):
+    """Metni yeniden puanlamada önbelleklenebilir parçalara böl"""
+    return [segment for segment in SEGMENT_BOUNDARY.split(prompt_text) if segment]
+
+def base_features(segment):
+    """Dil paketinden bağımsız, her noktadan bölünebilen özellikler"""
+    parts = segment.split('.')
+    if len(parts) == 1:
+        non_blank = bool(segment.strip())
+        sentences = (False, non_blank, 0, non_blank)
     else:
-        score -= 15
-        suggestions.append("Somut örnekler ekleyin")
+        sentences = (
+            True,
+            bool(parts[0].strip()),
+            sum(1 for part in parts[1:-1] if part.strip()),
+            bool(parts[-1].strip())
+        )
     
-    # 5. Kısıtlamalar ve formatlar
-    constraint_indicators = [
-        'kelime', 'karakter', 'paragraf', 'madde', 'liste', 'tablo', 'format',
-        'word', 'character', 'bullet', 'number', 'json', 'csv', 'markdown'
-    ]
-    has_constraints = any(indicator in prompt_text.lower() for indicator in constraint_indicators)
-    detailed_analysis["has_constraints"] = has_constraints
-    if has_constraints:
-        strengths.append("Format/kısıtlama belirtilmiş")
-        detailed_analysis["specificity_score"] += 25
-    else:
-        suggestions.append("Çıktı formatını belirtin (liste, paragraf, tablo vb.)")
+    is_upper = segment.isupper()
+    return {
+        "length": len(segment),
+        "word_count": len(segment.split()),
+        "sentences": sentences,
+        "has_numbers": re.search(r'\d', segment) is not None,
+        # isupper() birleşimi: büyük harfli veya harfsiz parçalar, en az biri büyük harfli
+        "no_lower": is_upper or (segment + "A").isupper(),
+        "any_upper": is_upper
+    }
+
+def lexicon_features(lower, languages):
+    """Seçili dil paketlerinin gösterge eşleşmeleri"""
+    packs = [compiled_lexicon(language) for language in languages]
     
-    # 6. Aksiyon odaklılık
-    action_words = [
-        'yaz', 'oluştur', 'analiz et', 'öner', 'listele', 'karşılaştır', 
-        'değerlendir', 'hesapla', 'tasarla', 'planla', 'write', 'create', 
-        'analyze', 'compare', 'evaluate', 'design', 'plan'
-    ]
-    has_action = any(action in prompt_text.lower() for action in action_words)
-    if has_action:
-        strengths.append("Net aksiyon belirtilmiş")
-        detailed_analysis["specificity_score"] += 25
-    else:
-        score -= 15
-        issues.append("Net aksiyon eksik")
-        suggestions.append("Ne yapılmasını istediğinizi net belirtin (yaz, analiz et, oluştur vb.)")
-    
-    # 7. Teknik detay kontrolü
-    technical_indicators = [
-        'api', 'kod', 'algoritma', 'database', 'sql', 'python', 'javascript',
-        'machine learning', 'data science', 'analytics', 'metrics', 'kpi'
-    ]
-    has_technical = any(indicator in prompt_text.lower() for indicator in technical_indicators)
-    if has_technical:
-        strengths.append("Teknik detaylar içeriyor")
-        detailed_analysis["specificity_score"] += 15
-    
-    # 8. Hedef kitle belirtimi
-    audience_indicators = [
-        'yaş', 'demographic', 'target', 'audience', 'müşteri profil', 'user persona',
-        'segment', 'market', 'b2b', 'b2c', 'enterprise', 'startup'
-    ]
-    has_audience = any(indicator in prompt_text.lower() for indicator in audience_indicators)
-    if has_audience:
-        strengths.append("Hedef kitle belirtilmiş")
-        detailed_analysis["specificity_score"] += 20
-    
-    # 9. Sayısal değerler
-    numbers = re.findall(r'\d+', prompt_text)
-    if numbers:
-        strengths.append("Sayısal değerler kullanılmış")
-        detailed_analysis["specificity_score"] += 15
-    else:
-        suggestions.append("Mümkünse sayısal hedefler ekleyin (miktar, yüzde, tarih)")
-    
-    # 10. Dil ve yazım kontrolü
-    if prompt_text.isupper():
-        score -= 10
-        issues.append("Tamamı büyük harf")
-        suggestions.append("Normal yazım kurallarını kullanın")
-    
-    # Toplam puanlama hesaplama
-    detailed_analysis["clarity_score"] = min(detailed_analysis["clarity_score"], 50)
-    detailed_analysis["specificity_score"] = min(detailed_analysis["specificity_score"], 50)
-    
-    final_score = max(0, min(100, score))
-    
-    # Grade hesaplama
-    if final_score >= 90:
-        grade = "A+"
-    elif final_score >= 85:
-        grade = "A"
-    elif final_score >= 80:
-        grade = "A-"
-    elif final_score >= 75:
-        grade = "B+"
-    elif final_score >= 70:
-        grade = "B"
-    elif final_score >= 65:
-        grade = "B-"
-    elif final_score >= 60:
-        grade = "C+"
-    elif final_score >= 55:
-        grade = "C"
-    elif final_score >= 50:
-        grade = "C-"
-    elif final_score >= 40:
-        grade = "D"
+    def has(category):
+        return any(pack[category] is not None and pack[category].search(lower) for pack in packs)
+    
+    features = {f"has_{category}": has(category) for category in LEXICON_CATEGORIES}
+    features["vague_words"] = frozenset(word for pack in packs for word in pack["vague"] if word in lower)
+    return features
+
+LEXICON_FLAGS = [f"has_{category}" for category in LEXICON_CATEGORIES]
+
+def merge_lexicon_features(left, right):
+    """İki gösterge eşleşme kümesini birleştir"""
+    merged = {flag: left[flag] or right[flag] for flag in LEXICON_FLAGS}
+    merged["vague_words"] = left["vague_words"] | right["vague_words"]
+    return merged
+
+def compute_segment_features(segment, languages=None):
+    """Bir metin parçasının birleştirilebilir kalite özelliklerini çıkar"""
+    lower = segment.lower()
+    if languages is None:
+        languages = detect_languages(lower)
+    return {**base_features(segment), **lexicon_features(lower, languages)}
+
+segment_features = shared(
+    "segment_features", lambda: functools.lru_cache(maxsize=SEGMENT_CACHE_SIZE)(compute_segment_features)
+)
+
+def combine_base_features(left, right, word_joined=False):
+    """Ardışık iki parçanın temel özelliklerini birleştir (word_joined: sınırda bölünmüş kelime)"""
+    l_dot, l_head, l_inner, l_tail = left["sentences"]
+    r_dot, r_head, r_inner, r_tail = right["sentences"]
+    if l_dot and r_dot:
+        sentences = (True, l_head, l_inner + r_inner + (l_tail or r_head), r_tail)
+    elif l_dot:
+        sentences = (True, l_head, l_inner, l_tail or r_head)
+    elif r_dot:
+        sentences = (True, l_head or r_head, r_inner, r_tail)
     else:
-        grade = "F"
+        sentences = (False, l_head or r_head, 0, l_head or r_head)
     
     return {
-        "score": final_score,
-        "grade": grade,
-        "issues": issues,
-        "suggestions": suggestions,
-        "strengths": strengths,
-        "detailed_analysis": detailed_analysis
+        "length": left["length"] + right["length"],
+        "word_count": left["word_count"] + right["word_count"] - int(word_joined),
+        "sentences": sentences,
+        "has_numbers": left["has_numbers"] or right["has_numbers"],
+        "no_lower": left["no_lower"] and right["no_lower"],
+        "any_upper": left["any_upper"] or right["any_upper"]
+    }
+
+def combine_features(left, right):
+    """Ardışık iki parçanın özelliklerini birleştir"""
+    return {**combine_base_features(left, right), **merge_lexicon_features(left, right)}
+
+def sentence_count(features):
+    """Birleştirilmiş cümle durumundan cümle sayısını hesapla"""
+    has_dot, head, inner, tail = features["sentences"]
+    if not has_dot:
+        return int(head)
+    return int(head) + inner + int(tail)
+
+def empty_prompt_analysis():
+    """Boş veya çok kısa prompt için analiz sonucu"""
+    return {
+        "score": 0,
+        "grade": "F",
+        "issues": ["Prompt çok kısa veya boş"],
+        "suggestions": ["En az 20-30 kelimelik açıklayıcı bir prompt yazın"],
+        "strengths": [],
+        "detailed_analysis": {}
+    }
+
+SCORE_CACHE = shared("score_cache", lambda: StripedCache(maxsize=16384))
+SCORE_CACHE_MAX_LENGTH = 20000
+
+def analyze_prompt_quality(prompt_text, plan=None):
+    """Prompt kalitesini analiz et ve puanlama yap"""
+    plan = plan or get_scoring_plan()
+    if len(prompt_text or "") > STREAM_THRESHOLD:
+        # Çok büyük metinlerde kopyalar oluşturmadan akış analizi
+        return analyze_prompt_stream(iter_text_chunks(prompt_text), plan=plan)
+    
+    if not prompt_text or len(prompt_text.strip()) < 10:
+        return empty_prompt_analysis()
+    
+    # Sonuçlar oturumlar arasında paylaşılır; çağıranlar değiştirmemeli.
+    # Anahtar plan sürümünü içerir: kurallar yenilenince eski puanlar kullanılmaz.
+    cacheable = len(prompt_text) <= SCORE_CACHE_MAX_LENGTH
+    if cacheable:
+        cached = SCORE_CACHE.get((plan.version, prompt_text))
+        if cached is not None:
+            return cached
+    
+    analysis = score_prompt_features(compute_segment_features(prompt_text), plan)
+    if cacheable:
+        SCORE_CACHE.put((plan.version, prompt_text), analysis)
+    return analysis
+
+def analyze_prompt_segments(prompt_text, plan=None):
+    """Prompt'u parça önbelleğini kullanarak analiz et (yalnızca değişen parçalar yeniden işlenir)"""
+    if not prompt_text or len(prompt_text.strip()) < 10:
+        return empty_prompt_analysis()
+    
+    # Dil paketleri tüm metin için bir kez seçilir; parçalar aynı paketlerle işlenir
+    languages = detect_languages(prompt_text.lower())
+    features = functools.reduce(
+        combine_features,
+        (segment_features(segment, languages) for segment in split_segments(prompt_text))
+    )
+    return score_prompt_features(features, plan)
+
+# Akış analizi: çok büyük metinler sabit boyutlu parçalarla işlenir
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_THRESHOLD = 256 * 1024
+
+def iter_text_chunks(text, chunk_size=STREAM_CHUNK_SIZE):
+    """Bellekteki metni kopyalamadan parça parça ver"""
+    for start in range(0, len(text), chunk_size):
+        yield text[start:start + chunk_size]
+
+def analyze_prompt_stream(chunks, chunk_size=STREAM_CHUNK_SIZE, plan=None):
+    """Metin parçalarını akış halinde tüketerek analiz et; bellek kullanımı girdi boyutundan bağımsızdır"""
+    state = {
+        "base": None,
+        "lexicons": {language: lexicon_features("", ()) for language in LEXICON_PACKS},
+        "hits": dict.fromkeys(LEXICON_PACKS, 0),
+        "previous": "",
+        "offset": 0,
+        "first_content": None,
+        "last_content": None
     }
+    
+    def consume(piece, following):
+        # Temel özellikler her noktadan bölünebilir; yalnızca bölünen kelime düzeltilir
+        piece_base = base_features(piece)
+        if state["base"] is None:
+            state["base"] = piece_base
+        else:
+            previous = state["previous"]
+            word_joined = not previous[-1].isspace() and not piece[0].isspace()
+            state["base"] = combine_base_features(state["base"], piece_base, word_joined)
+        
+        # Göstergeler önceki/sonraki bağlamla birlikte aranır: sınırı aşan eşleşmeler kaçmaz
+        before = state["previous"].lower()
+        lower_piece = piece.lower()
+        window = before + lower_piece + following.lower()
+        for language in LEXICON_PACKS:
+            found = lexicon_features(window, (language,))
+            state["lexicons"][language] = merge_lexicon_features(state["lexicons"][language], found)
+            needed = compiled_lexicon(language)["min_hits"] - state["hits"][language]
+            if needed > 0:
+                state["hits"][language] += language_hits(
+                    window, language, limit=needed,
+                    start=len(before), end=len(before) + len(lower_piece)
+                )
+        
+        # strip() sonrası uzunluk için ilk ve son boşluk olmayan karakter konumları
+        content = piece.lstrip()
+        if content:
+            if state["first_content"] is None:
+                state["first_content"] = state["offset"] + len(piece) - len(content)
+            state["last_content"] = state["offset"] + len(piece.rstrip()) - 1
+        state["offset"] += len(piece)
+        state["previous"] = (state["previous"] + piece)[-LEXICON_WINDOW:]
+    
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while len(buffer) - start > chunk_size + LEXICON_WINDOW:
+            consume(
+                buffer[start:start + chunk_size],
+                buffer[start + chunk_size:start + chunk_size + LEXICON_WINDOW]
+            )
+            start += chunk_size
+        buffer = buffer[start:]
+    if buffer:
+        consume(buffer, "")
+    
+    first, last = state["first_content"], state["last_content"]
+    if first is None or last - first + 1 < 10:
+        return empty_prompt_analysis()
+    
+    lexicon = lexicon_features("", ())
+    for language in LEXICON_PACKS:
+        if state["hits"][language] >= compiled_lexicon(language)["min_hits"]:
+            lexicon = merge_lexicon_features(lexicon, state["lexicons"][language])
+    return score_prompt_features({**state["base"], **lexicon}, plan)
+
+# Puanlama kuralları: data/scoring_rules.json (veya IWAPROMPT_SCORING_RULES ile verilen dosya).
+# Dosya değiştiğinde plan yeniden derlenir ve sürümü artar; eski sürüm puanları önbellekte ıskalanır.
+SCORING_RULES_PATH = os.environ.get(
+    "IWAPROMPT_SCORING_RULES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "scoring_rules.json")
+)
+SCORING_RELOAD_INTERVAL = 2.0
+
+# Kurallarda kullanılabilen türetilmiş özellikler
+DERIVED_FEATURES = {
+    "vague_count": lambda features: len(features["vague_words"]),
+    "all_caps": lambda features: features["no_lower"] and features["any_upper"]
+}
+NUMERIC_CONDITIONS = {"below", "above", "at_least", "at_most"}
+
+def rule_feature_types():
+    """Kurallarda kullanılabilen özellikler ve türleri (bool veya int)"""
+    sample = compute_segment_features("")
+    types = {name: type(value) for name, value in sample.items() if type(value) in (bool, int)}
+    types.update({name: type(derive(sample)) for name, derive in DERIVED_FEATURES.items()})
+    return types
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+RULE_CONDITIONS = {
+    "is": lambda value, expected: bool(value) == expected,
+    "below": lambda value, limit: value < limit,
+    "above": lambda value, limit: value > limit,
+    "at_least": lambda value, limit: value >= limit,
+    "at_most": lambda value, limit: value <= limit
+}
+RULE_OUTPUTS = {"feature", "score", "issue", "suggestion", "strength", "detail"}
+
+class ScoringPlan:
+    """Kural dosyasından derlenmiş puanlama planı; not eşikleri bisect tablosuyla aranır"""
+
+    def __init__(self, rules, version=0, mtime=None):
+        self.version = version
+        self.mtime = mtime
+        self.checked_at = time.monotonic()
+        self.feature_types = rule_feature_types()
+        
+        self.base_score = rules["base_score"]
+        self.min_score, self.max_score = rules["score_range"]
+        if not all(map(_is_number, (self.base_score, self.min_score, self.max_score))):
+            raise ValueError("base_score ve score_range sayı olmalı")
+        
+        self.detail_flags = tuple(rules["detail_flags"])
+        invalid = [flag for flag in self.detail_flags if self.feature_types.get(flag) is not bool]
+        if invalid:
+            raise ValueError(f"Geçersiz detail_flags: {', '.join(map(str, invalid))}")
+        
+        self.detail_caps = dict(rules["detail_caps"])
+        if not all(map(_is_number, self.detail_caps.values())):
+            raise ValueError("detail_caps değerleri sayı olmalı")
+        
+        self.rules = [self._compile_rule(number, rule) for number, rule in enumerate(rules["rules"], 1)]
+        
+        grades = sorted((item["min"], item["grade"]) for item in rules["grades"])
+        if not all(_is_number(cutoff) and isinstance(grade, str) for cutoff, grade in grades):
+            raise ValueError("grades: 'min' sayı, 'grade' metin olmalı")
+        self.cutoffs = [cutoff for cutoff, _ in grades]
+        self.grades = [rules["default_grade"]] + [grade for _, grade in grades]
+        
+        # Yayından önce örnek metinler üzerinde deneme: hatalı plan hiçbir oturuma ulaşmaz
+        for sample in ("", "Müşteriler için 3 örnekli rapor yaz."):
+            self.score(compute_segment_features(sample))
+
+    def _compile_rule(self, number, rule):
+        """Kuralı (özellik okuyucu, koşullar, puan, detay, çıktılar) demetine derle"""
+        if not isinstance(rule, dict):
+            raise ValueError(f"{number}. kural bir nesne olmalı")
+        feature = rule.get("feature")
+        feature_type = self.feature_types.get(feature)
+        if feature_type is None:
+            raise ValueError(f"{number}. kuralda bilinmeyen veya eksik özellik: {feature!r}")
+        if feature in DERIVED_FEATURES:
+            read = DERIVED_FEATURES[feature]
+        else:
+            read = lambda features, feature=feature: features[feature]
+        
+        unknown = set(rule) - RULE_OUTPUTS - set(RULE_CONDITIONS)
+        if unknown:
+            raise ValueError(f"{number}. kuralda bilinmeyen alanlar: {', '.join(sorted(unknown))}")
+        conditions = [(RULE_CONDITIONS[name], rule[name]) for name in RULE_CONDITIONS if name in rule]
+        if not conditions:
+            raise ValueError(f"{number}. kuralda koşul yok")
+        for name in RULE_CONDITIONS:
+            if name not in rule:
+                continue
+            if name == "is" and not isinstance(rule[name], bool):
+                raise ValueError(f"{number}. kuralda 'is' true/false olmalı")
+            if name in NUMERIC_CONDITIONS and (feature_type is bool or not _is_number(rule[name])):
+                raise ValueError(f"{number}. kuralda '{name}' sayısal bir özellik ve sayı gerektirir")
+        
+        detail = rule.get("detail", {})
+        if not isinstance(detail, dict):
+            raise ValueError(f"{number}. kuralda 'detail' bir nesne olmalı")
+        missing = set(detail) - set(self.detail_caps)
+        if missing:
+            raise ValueError(f"{number}. kuralda bilinmeyen detay puanı: {', '.join(sorted(missing))}")
+        if not _is_number(rule.get("score", 0)) or not all(map(_is_number, detail.values())):
+            raise ValueError(f"{number}. kuralda 'score' ve detay puanları sayı olmalı")
+        for output in ("issue", "suggestion", "strength"):
+            if not isinstance(rule.get(output, ""), str):
+                raise ValueError(f"{number}. kuralda '{output}' metin olmalı")
+        
+        return (
+            read, conditions, rule.get("score", 0), tuple(detail.items()),
+            rule.get("issue"), rule.get("suggestion"), rule.get("strength")
+        )
+
+    def grade(self, score):
+        """Puanı harf notuna çevir"""
+        return self.grades[bisect.bisect_right(self.cutoffs, score)]
+
+    def score(self, features):
+        """Birleştirilmiş özelliklerden puan, not ve öneriler üret"""
+        issues = []
+        suggestions = []
+        strengths = []
+        score = self.base_score
+        
+        # Detaylı analiz metrikleri
+        detailed_analysis = {
+            "length": features["length"],
+            "word_count": features["word_count"],
+            "sentence_count": sentence_count(features),
+            "has_context": False,
+            "has_examples": False,
+            "has_constraints": False,
+            "has_format_specs": False,
+            "has_action": False,
+            "has_technical": False,
+            "has_audience": False,
+            "has_numbers": False,
+            **{flag: features[flag] for flag in self.detail_flags},
+            **{name: 0 for name in self.detail_caps}
+        }
+        
+        for read, conditions, points, detail, issue, suggestion, strength in self.rules:
+            value = read(features)
+            if not all(check(value, expected) for check, expected in conditions):
+                continue
+            score += points
+            for name, amount in detail:
+                detailed_analysis[name] += amount
+            if issue:
+                issues.append(issue)
+            if suggestion:
+                suggestions.append(suggestion)
+            if strength:
+                strengths.append(strength)
+        
+        for name, cap in self.detail_caps.items():
+            detailed_analysis[name] = min(detailed_analysis[name], cap)
+        
+        final_score = max(self.min_score, min(self.max_score, score))
+        
+        return {
+            "score": final_score,
+            "grade": self.grade(final_score),
+            "issues": issues,
+            "suggestions": suggestions,
+            "strengths": strengths,
+            "detailed_analysis": detailed_analysis
+        }
+
+def load_scoring_plan(path=SCORING_RULES_PATH, version=0):
+    """Kural dosyasını oku ve puanlama planına derle"""
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, encoding="utf-8") as file:
+        return ScoringPlan(json.load(file), version=version, mtime=mtime)
+
+SCORING_PLAN = shared("scoring_plan", Snapshot)
+SCORING_PLAN_BUILDS = shared("scoring_plan_builds", SingleFlight)
+
+def _reload_scoring_plan():
+    """Dosya değiştiyse planı yeniden derle ve yeni sürüm olarak yayınla"""
+    current = SCORING_PLAN.get()
+    if current is not None:
+        current.checked_at = time.monotonic()
+    try:
+        if current is not None and os.stat(SCORING_RULES_PATH).st_mtime_ns == current.mtime:
+            return current
+        plan = load_scoring_plan(SCORING_RULES_PATH, version=SCORING_PLAN.version + 1)
+    except (OSError, ValueError, KeyError, TypeError):
+        # Hatalı veya yarım yazılmış dosya: eski planla devam et
+        if current is None:
+            raise
+        return current
+    SCORING_PLAN.replace(plan)
+    return plan
+
+def get_scoring_plan():
+    """Geçerli puanlama planı; dosya en fazla SCORING_RELOAD_INTERVAL'de bir denetlenir"""
+    current = SCORING_PLAN.get()
+    if current is not None and time.monotonic() - current.checked_at < SCORING_RELOAD_INTERVAL:
+        return current
+    return SCORING_PLAN_BUILDS.do("scoring_plan", _reload_scoring_plan)
+
+@warm_up_task("puanlama_planı", needs_corpus=False)
+def warm_up_scoring_plan():
+    """Puanlama kurallarını önceden derle"""
+    return get_scoring_plan()
+
+def score_prompt_features(features, plan=None):
+    """Birleştirilmiş özellikleri puanlama planıyla puanla"""
+    return (plan or get_scoring_plan()).score(features)
+
+def score_to_grade(score):
+    """Puanı harf notuna çevir"""
+    return get_scoring_plan().grade(score)
+
+# Token tahmini: sözlük gerektirmeyen, BPE tokenizer'larına yakın yaklaşım.
+# Ağırlıklar yarım token birimindedir; sonuç yukarı yuvarlanır.
+TOKEN_PATTERNS = [
+    (r'[A-Za-z]{1,4}', 2),       # ASCII harfler: ~4 karakter/token
+    (r'[^\x00-\x7F]', 1),        # ASCII dışı karakterler (ş, ğ, ü, emoji): ek bayt maliyeti
+    (r'[0-9]{1,3}', 2),          # sayılar: 3 haneli gruplar
+    (r'[!-/:-@\[-`{-~]', 2),     # noktalama ve semboller
+    (r'\n+', 2)                  # satır sonları
+]
+COMPILED_TOKEN_PATTERNS = [(re.compile(pattern), weight) for pattern, weight in TOKEN_PATTERNS]
+TOKEN_CACHE = shared("token_cache", lambda: StripedCache(maxsize=16384))
+TOKEN_BATCH_SIZE = 50_000
+
+# Model başına bağlam penceresi (token)
+MODEL_CONTEXT_WINDOWS = {
+    "ChatGPT (GPT-4o)": 128_000,
+    "Claude": 200_000,
+    "Gemini": 1_000_000
+}
+
+def estimate_tokens(text):
+    """Metnin tahmini token sayısı (prompt başına önbellekli)"""
+    if not text:
+        return 0
+    
+    cacheable = len(text) <= SCORE_CACHE_MAX_LENGTH
+    if cacheable:
+        cached = TOKEN_CACHE.get(text)
+        if cached is not None:
+            return cached
+    
+    half_tokens = sum(
+        weight * sum(1 for _ in pattern.finditer(text))
+        for pattern, weight in COMPILED_TOKEN_PATTERNS
+    )
+    tokens = (half_tokens + 1) // 2
+    if cacheable:
+        TOKEN_CACHE.put(text, tokens)
+    return tokens
+
+def _byte_class_table():
+    """UTF-8 baytlarını TOKEN_PATTERNS sınıflarına eşleyen tablo"""
+    table = np.zeros(256, dtype=np.uint8)
+    table[[ord(c) for c in string.ascii_letters]] = 1
+    table[[ord(c) for c in string.digits]] = 2
+    table[[ord(c) for c in string.punctuation]] = 3
+    table[ord("\n")] = 4
+    table[0xC0:] = 5  # UTF-8 başlangıç baytı = bir ASCII dışı karakter
+    return table
+
+BYTE_CLASSES = _byte_class_table()
+
+def _estimate_tokens_arrow(texts):
+    """TOKEN_PATTERNS'ın UTF-8 baytları üzerinde NumPy ile birebir karşılığı"""
+    array = pa.array(texts, type=pa.large_string())
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int64)[:len(texts) + 1]
+    if not offsets[-1]:
+        return np.zeros(len(texts), dtype=np.int64)
+    classes = BYTE_CLASSES[np.frombuffer(array.buffers()[2], dtype=np.uint8)[:offsets[-1]]]
+    
+    # Aynı sınıftaki ardışık baytlar bir koşu; koşular satır sınırında kesilir
+    boundary = np.empty(len(classes), dtype=bool)
+    boundary[0] = True
+    np.not_equal(classes[1:], classes[:-1], out=boundary[1:])
+    boundary[offsets[:-1][offsets[:-1] < len(classes)]] = True
+    starts = np.flatnonzero(boundary)
+    lengths = np.diff(np.append(starts, len(classes)))
+    run_classes = classes[starts]
+    
+    half_tokens = np.select(
+        [run_classes == 1, run_classes == 2, run_classes == 3, run_classes == 4, run_classes == 5],
+        [2 * (-(-lengths // 4)), 2 * (-(-lengths // 3)), 2 * lengths, 2, lengths],
+        0
+    )
+    cumulative = np.concatenate([[0], np.cumsum(half_tokens)])
+    row_runs = np.searchsorted(starts, offsets)
+    return (cumulative[row_runs[1:]] - cumulative[row_runs[:-1]] + 1) // 2
+
+def estimate_tokens_series(texts):
+    """Bir metin sütununun tahmini token sayıları (vektörel)"""
+    values = texts.fillna("").astype(str).to_numpy(dtype=object)
+    if pa is None:
+        return pd.Series([estimate_tokens(value) for value in values], index=texts.index, dtype=np.int64)
+    
+    counts = [
+        _estimate_tokens_arrow(values[start:start + TOKEN_BATCH_SIZE])
+        for start in range(0, len(values), TOKEN_BATCH_SIZE)
+    ]
+    return pd.Series(np.concatenate(counts) if counts else np.zeros(0, np.int64), index=texts.index)
+
+@st.cache_resource(show_spinner=False, hash_funcs={pd.DataFrame: corpus_key})
+def corpus_token_counts(df):
+    """Korpustaki tüm prompt'ların token sayıları (korpus sürümü başına bir kez)"""
+    return prompt_token_counts(df['prompt'])
+
+def prompt_token_counts(prompts):
+    """Kartlarda gösterilen ve kopyalanan temiz metnin (tırnaksız) token sayıları"""
+    clean = prompts.fillna("").astype(str).str.replace('"', '', regex=False).str.strip()
+    return estimate_tokens_series(clean)
+
+@warm_up_task("token_sayıları")
+def warm_up_token_counts(df):
+    """Korpus token sayılarını önceden hesapla"""
+    return corpus_token_counts(df)
+
+def context_usage(tokens):
+    """Model başına bağlam penceresi kullanım oranı (yüzde)"""
+    return {model: 100 * tokens / window for model, window in MODEL_CONTEXT_WINDOWS.items()}
+
+def format_context_usage(tokens):
+    """Token sayısı ve bağlam kullanımını tek satırda biçimlendir"""
+    usage = ", ".join(f"{model}: %{percent:.2f}" for model, percent in context_usage(tokens).items())
+    return f"🔢 ~{tokens:,} token · {usage}"
 
 def get_prompt_improvement_suggestions(analysis):
     """Analiz sonucuna göre gelişim önerileri"""
@@ -311,7 +1435,210 @@ def get_prompt_improvement_suggestions(analysis):
     
     return suggestions
 
-def display_quality_control_tab():
+# Toplu kalite analizi ayarları
+BULK_CHUNK_SIZE = 500
+BULK_PREVIEW_LENGTH = 120
+BULK_TABLE_LIMIT = 1000
+
+def iter_uploaded_prompts(uploaded_file):
+    """Yüklenen CSV/TXT dosyasındaki prompt'ları satır satır akıt"""
+    uploaded_file.seek(0)
+    # utf-8-sig: Excel'in "CSV UTF-8" çıktısındaki BOM başlığa karışmasın
+    text = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        if uploaded_file.name.lower().endswith(".csv"):
+            reader = csv.reader(text)
+            header = next(reader, None)
+            if not header:
+                return
+            columns = [column.strip().lower() for column in header]
+            if 'prompt' in columns:
+                prompt_column = columns.index('prompt')
+            else:
+                # Başlık satırı yoksa ilk sütun prompt kabul edilir
+                prompt_column = 0
+                if header[0].strip():
+                    yield header[0]
+            for row in reader:
+                if len(row) > prompt_column and row[prompt_column].strip():
+                    yield row[prompt_column]
+        else:
+            for line in text:
+                if line.strip():
+                    yield line.rstrip("\r\n")
+    finally:
+        # UploadedFile'ı kapatmadan sarmalayıcıyı ayır
+        text.detach()
+
+def score_prompt_chunk(prompts):
+    """Bir parça prompt'u puanla ve kompakt satırlar döndür"""
+    # Parçanın tamamı aynı plan sürümüyle puanlanır
+    plan = get_scoring_plan()
+    rows = []
+    for prompt in prompts:
+        analysis = analyze_prompt_quality(prompt, plan)
+        preview = prompt[:BULK_PREVIEW_LENGTH] + "..." if len(prompt) > BULK_PREVIEW_LENGTH else prompt
+        rows.append((
+            preview,
+            analysis["detailed_analysis"].get("word_count", 0),
+            analysis["score"],
+            analysis["grade"]
+        ))
+    return rows
+
+def score_prompts_bulk(prompts, chunk_size=BULK_CHUNK_SIZE):
+    """Prompt akışını parçalar halinde puanla; her parça bitince ilerleme için döndürülür"""
+    # Puanlama saf Python (GIL'e bağlı); iş parçacığı havuzu hızlandırmadığından sırayla çalışır
+    chunk = []
+    for prompt in prompts:
+        chunk.append(prompt)
+        if len(chunk) >= chunk_size:
+            yield score_prompt_chunk(chunk)
+            chunk = []
+    if chunk:
+        yield score_prompt_chunk(chunk)
+
+BULK_COLUMNS = ["Prompt", "Kelime", "Puan", "Not"]
+
+def display_bulk_quality_section():
+    """CSV/TXT dosyasından toplu kalite analizi"""
+    with st.expander("📦 Toplu Analiz (CSV/TXT Yükle)", expanded=False):
+        st.write("Her satırda bir prompt olan TXT veya `prompt` sütunlu CSV dosyası yükleyin.")
+        uploaded_file = st.file_uploader("Prompt dosyası:", type=["csv", "txt"], key="bulk_upload")
+        
+        if uploaded_file is None:
+            return
+        
+        cached = st.session_state.get('bulk_results')
+        if cached is None or cached[0] != uploaded_file.file_id:
+            if not st.button("🔍 Toplu Analizi Başlat", type="primary", key="bulk_start"):
+                return
+            
+            progress = st.progress(0.0, text="🔄 Prompt'lar puanlanıyor...")
+            table = st.empty()
+            rows = []
+            total_bytes = max(uploaded_file.size, 1)
+            
+            for chunk_rows in score_prompts_bulk(iter_uploaded_prompts(uploaded_file)):
+                rows.extend(chunk_rows)
+                done = min(uploaded_file.tell() / total_bytes, 1.0)
+                progress.progress(done, text=f"🔄 {len(rows)} prompt puanlandı...")
+                table.dataframe(pd.DataFrame(rows[-BULK_TABLE_LIMIT:], columns=BULK_COLUMNS))
+            
+            progress.progress(1.0, text=f"✅ {len(rows)} prompt puanlandı")
+            table.empty()
+            cached = (uploaded_file.file_id, pd.DataFrame(rows, columns=BULK_COLUMNS))
+            st.session_state['bulk_results'] = cached
+        
+        results = cached[1]
+        if results.empty:
+            st.warning("⚠️ Dosyada puanlanacak prompt bulunamadı.")
+            return
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Toplam Prompt", len(results))
+        with col2:
+            st.metric("Ortalama Puan", f"{results['Puan'].mean():.1f}")
+        with col3:
+            st.metric("En Yüksek Puan", int(results['Puan'].max()))
+        
+        st.dataframe(results)
+        st.download_button(
+            "⬇️ Sonuçları İndir (CSV)",
+            # CSV yalnızca indirme tıklandığında üretilir, her yeniden çalıştırmada değil
+            data=functools.partial(results.to_csv, index=False),
+            file_name="prompt_kalite_sonuclari.csv",
+            mime="text/csv",
+            on_click="ignore"
+        )
+
+def display_analysis_history():
+    """Kullanıcının son analizleri"""
+    analyses = load_user_data()["analyses"]
+    if not analyses:
+        return
+    
+    with st.expander(f"🕘 Son Analizler ({len(analyses)})", expanded=False):
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    (text[:BULK_PREVIEW_LENGTH], score, grade, datetime.fromtimestamp(created_at).strftime('%d.%m.%Y %H:%M'))
+                    for text, score, grade, created_at in analyses
+                ],
+                columns=["Prompt", "Puan", "Not", "Tarih"]
+            ),
+            hide_index=True
+        )
+
+# A/B karşılaştırmada gösterilen kriterler
+COMPARISON_CRITERIA = [
+    ("has_context", "Bağlam"),
+    ("has_examples", "Örnekler"),
+    ("has_constraints", "Kısıtlamalar"),
+    ("has_action", "Aksiyon"),
+    ("has_audience", "Hedef Kitle"),
+    ("has_numbers", "Sayısal")
+]
+MAX_VARIANTS = 10
+
+def compare_prompt_variants(variants, numbers=None):
+    """Varyantları puanla ve ilk varyanta göre kriter farklarını hesapla (numbers: kutu numaraları)"""
+    numbers = numbers or range(1, len(variants) + 1)
+    # Tüm varyantlar aynı plan sürümüyle puanlanır; yeniden yükleme farkları bozmaz
+    plan = get_scoring_plan()
+    analyses = [analyze_prompt_segments(variant, plan) for variant in variants]
+    baseline = analyses[0]
+    rows = []
+    
+    for number, analysis in zip(numbers, analyses):
+        detail = analysis["detailed_analysis"]
+        base_detail = baseline["detailed_analysis"]
+        row = {
+            "Varyant": f"V{number}",
+            "Puan": analysis["score"],
+            "Δ Puan": analysis["score"] - baseline["score"],
+            "Not": analysis["grade"],
+            "Netlik": detail.get("clarity_score", 0),
+            "Spesifiklik": detail.get("specificity_score", 0)
+        }
+        for key, label in COMPARISON_CRITERIA:
+            value = detail.get(key, False)
+            marker = "✅" if value else "❌"
+            if value != base_detail.get(key, False):
+                marker += " (+)" if value else " (−)"
+            row[label] = marker
+        rows.append(row)
+    
+    return pd.DataFrame(rows)
+
+def display_comparison_section():
+    """Prompt varyantlarını yan yana karşılaştırma"""
+    with st.expander("⚖️ A/B Karşılaştırma", expanded=False):
+        st.write("Prompt'unuzun farklı versiyonlarını girin; farklar ilk varyanta (V1) göre gösterilir.")
+        variant_count = st.number_input(
+            "Varyant sayısı:", min_value=2, max_value=MAX_VARIANTS, **persistent_widget("variant_count")
+        )
+        
+        variants = []
+        columns = st.columns(2)
+        for i in range(int(variant_count)):
+            with columns[i % 2]:
+                variants.append(st.text_area(f"V{i + 1}:", height=120, **persistent_widget(f"variant_{i}")))
+        
+        # Boş kutular atlanır ama satırlar kutu numarasıyla etiketlenir; taban ilk dolu kutudur
+        filled = [(number, variant) for number, variant in enumerate(variants, 1) if variant.strip()]
+        if len(filled) < 2:
+            st.info("💡 Karşılaştırma için en az iki varyant girin.")
+            return
+        
+        numbers, texts = zip(*filled)
+        if numbers[0] != 1:
+            st.caption(f"V1 boş; farklar V{numbers[0]} varyantına göre gösteriliyor.")
+        st.dataframe(compare_prompt_variants(list(texts), list(numbers)), hide_index=True)
+
+@profiled_fragment
+def display_quality_control_tab(df=None):
     """Kalite kontrol sekmesi"""
     st.header("🎯 Prompt Kalite Kontrol Merkezi")
     st.markdown("""
@@ -328,7 +1655,8 @@ def display_quality_control_tab():
             "Analiz edilecek prompt:",
             height=150,
             placeholder="Buraya prompt'unuzu yazın...\n\nÖrnek: 25-40 yaş teknoloji profesyonelleri için LinkedIn'de 10.000₺ bütçeli B2B kampanya tasarla. Mevcut CTR %2.1, hedef %3.5. Rekabetçi analiz dahil et.",
-            help="En az 10 kelimelik bir prompt yazın"
+            help="En az 10 kelimelik bir prompt yazın",
+            **persistent_widget("quality_prompt")
         )
         
         analyze_button = st.button("🔍 Kalite Analizi Yap", type="primary")
@@ -350,6 +1678,8 @@ def display_quality_control_tab():
     if analyze_button and user_prompt:
         with st.spinner("🔄 Prompt analiz ediliyor..."):
             analysis = analyze_prompt_quality(user_prompt)
+            QUALITY_STATS.record(analysis["score"])
+            record_analysis(user_prompt, analysis)
             
             # Sonuçları göster
             st.markdown("---")
@@ -403,6 +1733,10 @@ def display_quality_control_tab():
                 st.write(f"• Kelime sayısı: {detail['word_count']}")
                 st.write(f"• Karakter sayısı: {detail['length']}")
                 st.write(f"• Cümle sayısı: {detail['sentence_count']}")
+                tokens = estimate_tokens(user_prompt)
+                st.write(f"• Tahmini token: ~{tokens:,}")
+                for model, percent in context_usage(tokens).items():
+                    st.write(f"• {model} bağlam kullanımı: %{percent:.2f}")
                 st.write(f"• Netlik puanı: {detail['clarity_score']}/50")
                 st.write(f"• Spesifiklik puanı: {detail['specificity_score']}/50")
             
@@ -435,10 +1769,16 @@ def display_quality_control_tab():
                 ]
                 for example in examples:
                     st.markdown(example)
+            
+            display_template_suggestions(analysis, df)
     
     elif analyze_button and not user_prompt:
         st.error("❌ Lütfen analiz edilecek bir prompt girin!")
     
+    display_analysis_history()
+    display_comparison_section()
+    display_bulk_quality_section()
+    
     
     st.markdown("---")
     st.markdown("### 📚 Kalite Kontrol İpuçları")
@@ -514,21 +1854,255 @@ def get_prompt_templates_by_quality():
         ]
     }
 
+@warm_up_task("kalite_analizi", needs_corpus=False)
+def warm_up_quality_analysis():
+    """Kalite analizini şablon örnekleriyle ısıt"""
+    for templates in get_prompt_templates_by_quality().values():
+        for template in templates:
+            analyze_prompt_quality(template["template"])
+            if "improved" in template:
+                analyze_prompt_quality(template["improved"])
+
+# Öneri motoru: analiz özelliklerinden sayısal vektör ve en yakın komşu indeksi
+FEATURE_VECTOR_FLAGS = [
+    "has_context", "has_examples", "has_constraints", "has_action",
+    "has_technical", "has_audience", "has_numbers"
+]
+LIBRARY_SUGGESTION_MIN_SCORE = 85
+SUGGESTION_COUNT = 3
+
+def prompt_feature_vector(analysis):
+    """Analiz sonucunu kompakt bir sayısal vektöre dönüştür"""
+    detail = analysis["detailed_analysis"]
+    vector = [1.0 if detail.get(flag) else 0.0 for flag in FEATURE_VECTOR_FLAGS]
+    vector.append(detail.get("clarity_score", 0) / 50)
+    vector.append(detail.get("specificity_score", 0) / 50)
+    vector.append(min(detail.get("word_count", 0), 200) / 200)
+    return np.array(vector, dtype=np.float32)
+
+def suggestion_candidates(df=None, plan=None):
+    """Gelişmiş şablonları ve yüksek puanlı kütüphane prompt'larını topla"""
+    plan = plan or get_scoring_plan()
+    candidates = []
+    for level, templates in get_prompt_templates_by_quality().items():
+        for template in templates:
+            candidates.append({
+                "title": template["title"],
+                "text": template.get("improved", template["template"]),
+                "source": f"Şablon · {level}"
+            })
+    
+    if df is not None:
+        for role, prompt in zip(df['act'], df['prompt']):
+            if not isinstance(prompt, str):
+                continue
+            if analyze_prompt_quality(prompt, plan)["score"] >= LIBRARY_SUGGESTION_MIN_SCORE:
+                candidates.append({"title": role, "text": prompt, "source": "Kütüphane"})
+    
+    return candidates
+
+def build_suggestion_index(df, plan):
+    """Aday prompt'ların özellik vektörlerinden en yakın komşu indeksi oluştur"""
+    candidates = suggestion_candidates(df, plan)
+    matrix = np.vstack([
+        prompt_feature_vector(analyze_prompt_quality(candidate["text"], plan))
+        for candidate in candidates
+    ])
+    return matrix, candidates
+
+# Öneri indeksi (korpus ve plan sürümü başına). Kural dosyası yeniden yüklendiğinde yeni indeks
+# arka planda kurulur; hazır olana kadar önceki indeks sunulur, öneriler beklemez.
+SUGGESTION_INDEX = shared("suggestion_index", Snapshot)
+SUGGESTION_BUILDS = shared("suggestion_builds", SingleFlight)
+SUGGESTION_REFRESH = shared("suggestion_refresh", lambda: {"lock": threading.Lock(), "running": False})
+
+def _suggestion_index_key(df, plan):
+    return (corpus_key(df) if df is not None else None, plan.version)
+
+def _rebuild_suggestion_index(df, plan):
+    """İndeksi kur ve yayınla (aynı anahtar için tek kurulum)"""
+    key = _suggestion_index_key(df, plan)
+
+    def current():
+        index = SUGGESTION_INDEX.get()
+        return index if index is not None and index[0] == key else None
+
+    def build():
+        index = (key, *build_suggestion_index(df, plan))
+        SUGGESTION_INDEX.replace(index)
+        return index
+
+    return current() or SUGGESTION_BUILDS.do("suggestions", build, is_fresh=current)
+
+def _refresh_suggestion_index(df, plan):
+    """Arka plan yeniden kurulumu; bitince yeni yenilemelere izin ver"""
+    try:
+        _rebuild_suggestion_index(df, plan)
+    finally:
+        with SUGGESTION_REFRESH["lock"]:
+            SUGGESTION_REFRESH["running"] = False
+
+def get_suggestion_index(df=None, plan=None):
+    """Güncel öneri indeksi; eskimişse önceki sürümü döndürüp arka planda yeniden kur"""
+    plan = plan or get_scoring_plan()
+    current = SUGGESTION_INDEX.get()
+    if current is None:
+        return _rebuild_suggestion_index(df, plan)
+    if current[0] != _suggestion_index_key(df, plan):
+        with SUGGESTION_REFRESH["lock"]:
+            start = not SUGGESTION_REFRESH["running"]
+            SUGGESTION_REFRESH["running"] = True
+        if start:
+            threading.Thread(
+                target=_refresh_suggestion_index, args=(df, plan),
+                name="iwaprompt-suggestion-refresh", daemon=True
+            ).start()
+    return current
+
+@warm_up_task("öneri_indeksi")
+def warm_up_suggestion_index(df):
+    """Öneri indeksini korpusla birlikte önceden oluştur"""
+    return _rebuild_suggestion_index(df, get_scoring_plan())
+
+def suggest_templates(analysis, df=None, count=SUGGESTION_COUNT):
+    """Analize en yakın şablon ve kütüphane prompt'larını döndür"""
+    if not analysis["detailed_analysis"]:
+        return []
+    
+    _, matrix, candidates = get_suggestion_index(df)
+    distances = np.square(matrix - prompt_feature_vector(analysis)).sum(axis=1)
+    count = min(count, len(candidates))
+    nearest = np.argpartition(distances, count - 1)[:count]
+    nearest = nearest[np.argsort(distances[nearest])]
+    return [candidates[i] for i in nearest]
+
+def display_template_suggestions(analysis, df=None):
+    """Analiz sonrası en yakın şablon önerilerini göster"""
+    suggestions = suggest_templates(analysis, df)
+    if not suggestions:
+        return
+    
+    st.markdown("### 🧭 Size En Yakın Şablonlar")
+    for suggestion in suggestions:
+        with st.expander(f"📋 {suggestion['title']} ({suggestion['source']})", expanded=False):
+            st.code(suggestion["text"], language="text")
+
+# Sekme kimlikleri ve başlıkları (aktif sekme st.session_state['active_tab'] içinde)
+TAB_LABELS = {
+    "library": "📚 Prompt Kütüphanesi",
+    "tips": "💡 Kullanım İpuçları",
+    "templates": "📋 Hazır Şablonlar",
+    "quality": "🎯 Kalite Kontrol"
+}
+TAB_IDS = {label: tab_id for tab_id, label in TAB_LABELS.items()}
+
+def open_tab(tab_id):
+    """Hızlı erişim: verilen sekmeyi aktif yap"""
+    st.session_state['active_tab'] = TAB_LABELS[tab_id]
+
 def display_header():
     """Ana başlık"""
     st.title("🤖 AI Prompt Koleksiyonu")
     st.subheader("ChatGPT, Claude ve Gemini için Profesyonel Prompt Şablonları")
     
-    
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📚 Prompt Kütüphanesi", 
-        "💡 Kullanım İpuçları",
-        "📋 Hazır Şablonlar",
-        "🎯 Kalite Kontrol"
-    ])
+    # Sekme değişince yeniden çalışır; yalnızca açık sekmenin içeriği hesaplanır
+    tab1, tab2, tab3, tab4 = st.tabs(
+        list(TAB_LABELS.values()),
+        key="active_tab",
+        on_change="rerun",
+        bind="query-params"
+    )
     
     return tab1, tab2, tab3, tab4
 
+# Otomatik tamamlama: roller ve sık geçen terimler için sıralı dizi önek indeksi
+AUTOCOMPLETE_TERM = r'[^\W\d_]{3,}'
+AUTOCOMPLETE_MIN_FREQUENCY = 2
+AUTOCOMPLETE_MAX_TERMS = 50_000
+AUTOCOMPLETE_TABLE_DEPTH = 2
+AUTOCOMPLETE_LIMIT = 5
+
+class AutocompleteIndex:
+    """Sıralı anahtarlar üzerinde bisect ile önek araması; öneriler belge sıklığına göre sıralanır"""
+
+    def __init__(self, entries, limit=AUTOCOMPLETE_LIMIT):
+        # entries: {küçük harfli anahtar: (etiket, tür, sıklık)}
+        self.limit = limit
+        self.keys = sorted(entries)
+        self.entries = [entries[key] for key in self.keys]
+        # Sıralama puanı: önce sıklık, eşitlikte roller önde
+        self.ranks = np.array(
+            [2 * frequency + (kind == "rol") for _, kind, frequency in self.entries], dtype=np.int64
+        )
+        
+        # Kısa önekler çok geniş aralık kapsar; ilk sonuçları önceden hesapla
+        self.table = {}
+        for depth in range(1, AUTOCOMPLETE_TABLE_DEPTH + 1):
+            for prefix in {key[:depth] for key in self.keys if len(key) >= depth}:
+                self.table[prefix] = self._top(*self._range(prefix), limit + 1)
+
+    def _range(self, prefix):
+        start = bisect.bisect_left(self.keys, prefix)
+        return start, bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+
+    def _top(self, start, end, count):
+        """[start, end) aralığında en yüksek puanlı count konum; eşitlikte alfabetik"""
+        order = np.argsort(-self.ranks[start:end], kind="stable")[:count]
+        return (order + start).tolist()
+
+    def suggest(self, text, limit=None):
+        """Öneki text ile başlayan en sık anahtarları (etiket, tür, sıklık) olarak döndür"""
+        limit = limit or self.limit
+        prefix = text.strip().lower()
+        if not prefix:
+            return []
+        if len(prefix) <= AUTOCOMPLETE_TABLE_DEPTH and limit <= self.limit:
+            positions = self.table.get(prefix, [])
+        else:
+            positions = self._top(*self._range(prefix), limit + 1)
+        return [self.entries[position] for position in positions if self.keys[position] != prefix][:limit]
+
+@st.cache_resource(show_spinner=False, hash_funcs={pd.DataFrame: corpus_key})
+def build_autocomplete_index(df):
+    """Rol adları ve prompt terimlerinden otomatik tamamlama indeksi (korpus sürümü başına bir kez)"""
+    roles = df['act'].dropna().astype(str).str.strip()
+    role_counts = roles[roles != ""].value_counts()
+    
+    terms = df['prompt'].fillna("").astype(str).str.lower().str.findall(AUTOCOMPLETE_TERM).explode().dropna()
+    term_counts = (
+        pd.DataFrame({"document": terms.index, "term": terms.to_numpy()})
+        .drop_duplicates()["term"]
+        .value_counts()
+    )
+    term_counts = term_counts[term_counts >= AUTOCOMPLETE_MIN_FREQUENCY].head(AUTOCOMPLETE_MAX_TERMS)
+    
+    entries = {term: (term, "terim", int(count)) for term, count in term_counts.items()}
+    for role, count in role_counts.items():
+        entries[role.lower()] = (role, "rol", int(count))
+    return AutocompleteIndex(entries)
+
+@warm_up_task("otomatik_tamamlama")
+def warm_up_autocomplete(df):
+    """Otomatik tamamlama indeksini önceden oluştur"""
+    return build_autocomplete_index(df)
+
+def display_search_suggestions(df, search_term):
+    """Arama kutusunun altında rol ve terim önerileri"""
+    suggestions = build_autocomplete_index(df).suggest(search_term)
+    if not suggestions:
+        return
+    
+    suggestion_columns = st.columns(len(suggestions))
+    for i, (label, kind, frequency) in enumerate(suggestions):
+        with suggestion_columns[i]:
+            st.button(
+                f"{'🎭' if kind == 'rol' else '🔤'} {label}",
+                key=f"autocomplete_{i}",
+                help=f"{frequency} prompt",
+                on_click=use_search_term,
+                args=(label,)
+            )
+
 def display_search_filters(df):
     """Arama ve filtreleme"""
     st.subheader("🔍 Prompt Ara ve Filtrele")
@@ -539,8 +2113,11 @@ def display_search_filters(df):
         search_term = st.text_input(
             "Anahtar kelime ile ara:",
             placeholder="Örn: marketing, yazılım, müşteri hizmetleri, satış...",
-            help="Prompt içeriğinde veya rol adında arama yapar"
+            help="Prompt içeriğinde veya rol adında arama yapar",
+            **persistent_widget("search_term")
         )
+        if search_term and df is not None:
+            display_search_suggestions(df, search_term)
     
     with col2:
         if df is not None and 'act' in df.columns:
@@ -554,7 +2131,8 @@ def display_search_filters(df):
             
             selected_role = st.selectbox(
                 "Popüler Roller:",
-                options=featured_roles
+                options=featured_roles,
+                **persistent_widget("selected_role")
             )
         else:
             selected_role = "Tümü"
@@ -582,14 +2160,305 @@ def filter_prompts(df, search_term, selected_role):
     
     return filtered_df
 
-def display_prompt_details(role, prompt, index):
+# Parçalı arama: büyük korpus parçalara bölünür, her parça kendi indeksiyle
+# ayrı bir işçi süreçte çalışır; sorgular tüm parçalara dağıtılıp birleştirilir.
+# İndeks ve işçi döngüsü iwaprompt_shards modülündedir (alt süreçler onu içe aktarır).
+SEARCH_SHARDS = int(os.environ.get("IWAPROMPT_SHARDS", os.cpu_count() or 1))
+SHARD_MIN_ROWS = 50_000
+SEARCH_RESULT_LIMIT = 1000
+SHARD_QUERY_TIMEOUT = 30
+# Çok iş parçacıklı sunucudan fork güvenli değil; işçiler temiz bir süreçten başlatılır
+SHARD_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+class ShardPoolError(RuntimeError):
+    """Arama havuzu kapatıldı veya bir işçi süreç yanıt vermiyor"""
+
+class LocalShards:
+    """Tek parça: küçük korpuslarda süreçler arası iletişim maliyetine değmez"""
+
+    def __init__(self, df, token_counts=None):
+        self.corpus_version = corpus_key(df)
+        self.shards = 1
+        if token_counts is None:
+            token_counts = corpus_token_counts(df)
+        self._index = ShardIndex(df, token_counts)
+
+    def query(self, search_term, selected_role, limit=SEARCH_RESULT_LIMIT):
+        return self._index.query(search_term, selected_role, limit)
+
+    def close(self):
+        pass
+
+class ShardWorker:
+    """Bir işçi süreç ve bağlantısı; yanıtlar istek numarasıyla eşleştirilir, böylece
+    oturumlar aynı işçiye sırayla yazar ama birbirlerinin yanıtını beklemez"""
+
+    def __init__(self, context, number, df, token_counts):
+        self.number = number
+        self.connection, child = context.Pipe()
+        self.process = context.Process(
+            target=shard_worker, args=(child, df, token_counts),
+            name=f"iwaprompt-shard-{number}", daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.pending = {}
+        self.broken = False
+        self._send_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        threading.Thread(
+            target=self._receive, name=f"iwaprompt-shard-reader-{number}", daemon=True
+        ).start()
+
+    def submit(self, request_id, query):
+        future = Future()
+        with self._pending_lock:
+            if self.broken:
+                raise ShardPoolError(f"Arama işçisi {self.number} kullanılamıyor")
+            self.pending[request_id] = future
+        try:
+            with self._send_lock:
+                self.connection.send((request_id, query))
+        except (OSError, ValueError) as e:
+            self._fail(e)
+        return future
+
+    def _receive(self):
+        """Yanıt okuyucu: işçi ölürse bekleyen tüm istekler hatayla sonlanır"""
+        while True:
+            try:
+                request_id, result = self.connection.recv()
+            except (EOFError, OSError) as e:
+                self._fail(e)
+                return
+            with self._pending_lock:
+                future = self.pending.pop(request_id, None)
+            if future is not None:
+                future.set_result(result)
+
+    def _fail(self, error):
+        with self._pending_lock:
+            self.broken = True
+            pending, self.pending = self.pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ShardPoolError(f"Arama işçisi {self.number} bağlantısı koptu: {error!r}"))
+
+    def close(self):
+        try:
+            with self._send_lock:
+                self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+class ShardPool:
+    """Her biri bir korpus parçasına sahip kalıcı işçi süreç havuzu"""
+
+    def __init__(self, df, shards, token_counts=None):
+        self.corpus_version = corpus_key(df)
+        self.shards = shards
+        self._closed = False
+        self._request_ids = itertools.count()
+        if token_counts is None:
+            token_counts = corpus_token_counts(df)
+        context = multiprocessing.get_context(SHARD_START_METHOD)
+        bounds = np.linspace(0, len(df), shards + 1).astype(int)
+        self._workers = [
+            ShardWorker(context, number, df.iloc[start:end][['act', 'prompt']], token_counts[start:end])
+            for number, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))
+        ]
+
+    @property
+    def broken(self):
+        return any(worker.broken for worker in self._workers)
+
+    def query(self, search_term, selected_role, limit=SEARCH_RESULT_LIMIT):
+        """Sorguyu tüm parçalara gönder, yanıtları topla ve birleştir"""
+        if self._closed:
+            raise ShardPoolError("Arama havuzu kapatıldı")
+        request_id = next(self._request_ids)
+        query = (search_term, selected_role, limit)
+        futures = [worker.submit(request_id, query) for worker in self._workers]
+        _, late = wait(futures, timeout=SHARD_QUERY_TIMEOUT)
+        if late:
+            # Yanıt vermeyen işçi öldürülür (SIGKILL durdurulmuş süreçte de etkilidir); havuz bozuk sayılır ve yeniden kurulur
+            for worker, future in zip(self._workers, futures):
+                if future in late:
+                    worker._fail(TimeoutError(f"{SHARD_QUERY_TIMEOUT} sn içinde yanıt yok"))
+                    worker.process.kill()
+            raise ShardPoolError("Arama işçisi zamanında yanıt vermedi")
+        results = [future.result() for future in futures]
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return merge_shard_results(results, limit)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            worker.close()
+
+def create_search_shards(df, shards=None):
+    """Korpus boyutuna göre yerel indeks veya işçi süreç havuzu oluştur"""
+    if shards is None:
+        shards = min(SEARCH_SHARDS, len(df) // SHARD_MIN_ROWS)
+    if shards <= 1:
+        return LocalShards(df)
+    return ShardPool(df, shards)
+
+def _search_shard_pool():
+    """Paylaşılan havuz anlık görüntüsü; süreç kapanırken işçiler bir kez durdurulur"""
+    pool = Snapshot()
+
+    def close():
+        shards = pool.get()
+        if shards is not None:
+            shards.close()
+
+    atexit.register(close)
+    return pool
+
+SEARCH_SHARD_POOL = shared("search_shard_pool", _search_shard_pool)
+SEARCH_CACHE = shared("search_cache", lambda: StripedCache(maxsize=256))
+SEARCH_SHARD_BUILDS = shared("search_shard_builds", SingleFlight)
+LOCAL_SEARCH_INDEX = shared("local_search_index", Snapshot)
+
+def get_search_shards(df):
+    """Korpus sürümüne ait arama parçaları; yeni sürümde veya bozulan havuzda eskisi kapatılır"""
+    def current():
+        shards = SEARCH_SHARD_POOL.get()
+        if (shards is not None and shards.corpus_version == corpus_key(df)
+                and not getattr(shards, "broken", False)):
+            return shards
+        return None
+
+    def build():
+        shards = create_search_shards(df)
+        previous = SEARCH_SHARD_POOL.get()
+        SEARCH_SHARD_POOL.replace(shards)
+        if previous is not None:
+            previous.close()
+        return shards
+
+    return current() or SEARCH_SHARD_BUILDS.do("shards", build, is_fresh=current)
+
+def get_local_search_index(df):
+    """Havuz kullanılamadığında yedek tek parçalı indeks; korpus sürümü başına bir kez kurulur"""
+    def current():
+        index = LOCAL_SEARCH_INDEX.get()
+        if index is not None and index.corpus_version == corpus_key(df):
+            return index
+        return None
+
+    def build():
+        index = LocalShards(df)
+        LOCAL_SEARCH_INDEX.replace(index)
+        return index
+
+    return current() or SEARCH_SHARD_BUILDS.do("local", build, is_fresh=current)
+
+def search_corpus(df, search_term, selected_role, limit=SEARCH_RESULT_LIMIT):
+    """filter_prompts'un parçalı karşılığı: (eşleşme sayısı, toplam token, korpus sırasıyla ilk limit etiket)"""
+    key = (corpus_key(df), search_term, selected_role, limit)
+    cached = SEARCH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    try:
+        result = get_search_shards(df).query(search_term, selected_role, limit)
+    except ShardPoolError:
+        # Havuz kapatıldı (yeni korpus) veya bir işçi öldü: bozuk havuz bir sonraki
+        # get_search_shards çağrısında yeniden kurulur, bu sorgu yedek indeksle yanıtlanır
+        result = get_local_search_index(df).query(search_term, selected_role, limit)
+    SEARCH_CACHE.put(key, result)
+    return result
+
+@warm_up_task("arama_parçaları")
+def warm_up_search_shards(df):
+    """Arama parçalarını ve işçi süreçleri önceden başlat"""
+    return get_search_shards(df)
+
+SNIPPET_CONTEXT = 90
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_{}\[\]()<>#+\-.!|~$:])")
+
+def compile_search_pattern(search_term):
+    """Arama terimini filter_prompts ile aynı kuralla derle; geçersiz ifadede None"""
+    try:
+        return re.compile(
+            re.escape(search_term) if REGEX_SPECIAL.isdisjoint(search_term) else search_term,
+            re.IGNORECASE
+        )
+    except re.error:
+        return None
+
+search_pattern = shared("search_pattern", lambda: functools.lru_cache(maxsize=256)(compile_search_pattern))
+
+def match_span(text, search_term):
+    """Terimin metindeki ilk eşleşme konumu (bulunamazsa None)"""
+    pattern = search_pattern(search_term) if search_term else None
+    match = pattern.search(text) if pattern else None
+    if match is None or match.end() == match.start():
+        return None
+    return match.span()
+
+def page_match_spans(df, search_term, selected_role, page, page_ids):
+    """Sayfadaki kartların eşleşme konumları; (korpus, terim, rol, sayfa) başına bir kez hesaplanıp
+    arama sonucuyla aynı önbellekte tutulur, sayfa/favori rerun'larında yeniden taranmaz"""
+    key = (corpus_key(df), search_term, selected_role, "spans", page)
+    spans = SEARCH_CACHE.get(key)
+    if spans is None:
+        spans = tuple(
+            match_span(prompt.replace('"', '').strip(), search_term) if isinstance(prompt, str) else None
+            for prompt in df.loc[page_ids, 'prompt']
+        )
+        SEARCH_CACHE.put(key, spans)
+    return spans
+
+def escape_markdown(text):
+    """Prompt metnindeki Markdown/yönerge karakterlerini kaçır (ör. ] vurguyu erken kapatmasın)"""
+    return MARKDOWN_SPECIAL.sub(r"\\\1", text)
+
+def keyword_snippet(text, start, end, context=SNIPPET_CONTEXT):
+    """Eşleşmenin çevresinden, kelime sınırlarına oturan vurgulu kesit"""
+    left = max(0, start - context)
+    right = min(len(text), end + context)
+    if left > 0:
+        space = text.find(" ", left, start)
+        left = space + 1 if space != -1 else left
+    if right < len(text):
+        space = text.rfind(" ", end, right)
+        right = space if space != -1 else right
+    return (
+        ("..." if left > 0 else "")
+        + escape_markdown(text[left:start])
+        + f"**:orange-background[{escape_markdown(text[start:end])}]**"
+        + escape_markdown(text[end:right])
+        + ("..." if right < len(text) else "")
+    )
+
+def display_prompt_details(role, prompt, index, match_span=None):
     """Her prompt için detaylı gösterim"""
     
 
     clean_prompt = prompt.replace('"', '').strip()
     
 
-    preview = clean_prompt[:200] + "..." if len(clean_prompt) > 200 else clean_prompt
+    # Arama eşleşmesi varsa çevresinden vurgulu kesit, yoksa baştan önizleme
+    if match_span is not None:
+        preview = keyword_snippet(clean_prompt, *match_span)
+    else:
+        preview = clean_prompt[:200] + "..." if len(clean_prompt) > 200 else clean_prompt
     
 
     role_tips = get_prompt_tips(role)
@@ -601,6 +2470,7 @@ def display_prompt_details(role, prompt, index):
 
         st.write("**Prompt Önizleme:**")
         st.info(preview)
+        st.caption(format_context_usage(estimate_tokens(clean_prompt)))
         
 
         tab1, tab2, tab3 = st.tabs(["📋 Tam Prompt", "💡 Kullanım İpuçları", "🚀 Hızlı Başlat"])
@@ -609,7 +2479,7 @@ def display_prompt_details(role, prompt, index):
             st.write("**Tam Prompt Metni:**")
             st.code(clean_prompt, language="text")
             
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             with col1:
                 if st.button(f"📋 Panoya Kopyala", key=f"copy_{index}", help="Prompt'u panoya kopyalar"):
                     st.success("✅ Prompt panoya kopyalandı! ChatGPT'ye yapıştırabilirsiniz.")
@@ -617,6 +2487,15 @@ def display_prompt_details(role, prompt, index):
             with col2:
                 chatgpt_url = f"https://chat.openai.com/"
                 st.markdown(f"[🔗 ChatGPT'de Aç]({chatgpt_url})")
+            
+            with col3:
+                is_favorite = (role, prompt) in load_user_data()["favorites"]
+                st.button(
+                    "💔 Favorilerden Çıkar" if is_favorite else "⭐ Favorilere Ekle",
+                    key=f"favorite_{index}",
+                    on_click=toggle_favorite,
+                    args=(role, prompt)
+                )
         
         with tab2:
             st.write("**Bu rolü daha etkili kullanmak için:**")
@@ -687,14 +2566,28 @@ def display_library_tab(df):
     search_term, selected_role = display_search_filters(df)
 
 
-    filtered_df = filter_prompts(df, search_term, selected_role)
+    record_search(search_term)
+    recent_searches = load_user_data()["searches"]
+    if recent_searches:
+        st.caption("🕘 Son aramalar:")
+        search_columns = st.columns(min(len(recent_searches), 5))
+        for i, term in enumerate(recent_searches[:5]):
+            with search_columns[i]:
+                st.button(term, key=f"recent_search_{i}", on_click=use_search_term, args=(term,))
+
+
+    result_count, result_tokens, result_ids = search_corpus(df, search_term, selected_role)
+    st.session_state['result_count'] = result_count
     
-    if filtered_df is not None and len(filtered_df) > 0:
+    if result_count > 0:
         
-        st.subheader(f"📋 Bulunan Prompts: {len(filtered_df)} adet")
+        st.subheader(f"📋 Bulunan Prompts: {result_count} adet")
+        st.caption(f"🔢 Ortalama ~{result_tokens / result_count:,.0f} token · toplam ~{result_tokens:,} token")
+        if result_count > len(result_ids):
+            st.caption(f"İlk {len(result_ids)} sonuç listeleniyor, aramanızı daraltın.")
         
         items_per_page = 5  
-        total_pages = (len(filtered_df) - 1) // items_per_page + 1
+        total_pages = (len(result_ids) - 1) // items_per_page + 1
         
         if total_pages > 1:
             page = st.selectbox(
@@ -707,15 +2600,29 @@ def display_library_tab(df):
         
         start_idx = (page - 1) * items_per_page
         end_idx = start_idx + items_per_page
-        page_df = filtered_df.iloc[start_idx:end_idx]
+        page_ids = result_ids[start_idx:end_idx]
+        page_df = df.loc[page_ids]
+        page_spans = page_match_spans(df, search_term, selected_role, page, page_ids)
         
-        for index, row in page_df.iterrows():
-            display_prompt_details(row['act'], row['prompt'], index)
+        for (index, row), match_span in zip(page_df.iterrows(), page_spans):
+            display_prompt_details(row['act'], row['prompt'], index, match_span)
     
     else:
         st.warning("🔍 Arama kriterlerinize uygun prompt bulunamadı.")
         st.info("💡 Farklı anahtar kelimeler deneyin veya filtreyi 'Tümü' yapın.")
 
+@profiled_fragment
+def display_library_section(df):
+    """Kütüphane sekmesinin tamamı (kendi fragment'ı içinde yeniden çalışır)"""
+    st.success(f"✅ {len(df)} prompt başarıyla yüklendi!")
+    display_library_tab(df)
+    
+    # Öne çıkan roller
+    display_favorites()
+    
+    # Kullanım kılavuzu
+    display_usage_guide()
+
 def display_usage_tips_tab():
     """Kullanım ipuçları sekmesi"""
     st.header("💡 AI Prompt Kullanım İpuçları")
@@ -787,118 +2694,204 @@ Bu kriterlere göre pazarlama
 stratejisi oluştur.
         """)
 
+# Şablon kaydı: data/templates.json bir kez yüklenir ve derlenir
+TEMPLATES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "templates.json")
+
+class CompiledTemplate:
+    """Yükleme sırasında alanları ayrıştırılıp doğrulanmış prompt şablonu"""
+
+    def __init__(self, category, name, template, fields=None):
+        parsed = []
+        pieces = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(template):
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if not field.isidentifier() or format_spec or conversion:
+                raise ValueError(f"'{name}' şablonunda geçersiz alan: {{{field}}}")
+            if field not in parsed:
+                parsed.append(field)
+            pieces.append(f"{{{parsed.index(field)}}}")
+        
+        if fields is not None and set(fields) != set(parsed):
+            raise ValueError(f"'{name}' şablonunun alan listesi metinle uyuşmuyor: {sorted(set(fields) ^ set(parsed))}")
+        
+        self.category = category
+        self.name = name
+        self.template = template
+        self.fields = tuple(fields if fields is not None else parsed)
+        # Alanlar konumsal indekslere derlenir: satır değerleri doğrudan biçimlenir
+        order = [self.fields.index(field) for field in parsed]
+        self._positional = "".join(pieces)
+        self._order = order
+
+    def fill(self, values):
+        return self.fill_values([values[field] for field in self.fields])
+
+    def fill_values(self, values):
+        """Alan sırasıyla verilen değerlerle şablonu doldur"""
+        return self._positional.format(*[values[i] for i in self._order])
+
+@st.cache_resource(show_spinner=False)
+def load_template_registry(path=TEMPLATES_PATH):
+    """Şablon dosyasını yükle ve her şablonu derle"""
+    with open(path, encoding="utf-8") as file:
+        raw = json.load(file)
+    
+    return {
+        category: [
+            CompiledTemplate(category, item["name"], item["template"], item.get("fields"))
+            for item in items
+        ]
+        for category, items in raw.items()
+    }
+
+@warm_up_task("şablon_kaydı", needs_corpus=False)
+def warm_up_template_registry():
+    """Şablon kaydını önceden yükle"""
+    return load_template_registry()
+
+def fill_template_rows(template, header, rows):
+    """CSV satırlarından doldurulmuş prompt'ları akıt (boş alanlı satırlar için None)"""
+    missing = [field for field in template.fields if field not in header]
+    if missing:
+        raise ValueError(f"CSV'de eksik sütunlar: {', '.join(missing)}")
+    
+    indices = [header.index(field) for field in template.fields]
+    for row in rows:
+        try:
+            values = [row[i].strip() for i in indices]
+        except IndexError:
+            yield None
+            continue
+        yield template.fill_values(values) if all(values) else None
+
+def write_filled_templates(template, source, output, max_rows=None):
+    """CSV alan değerlerini okuyup doldurulmuş prompt'ları CSV olarak yaz, sabit bellekle"""
+    written = skipped = 0
+    reader = csv.reader(source)
+    header = [column.strip() for column in next(reader, [])]
+    writer = csv.writer(output)
+    writer.writerow(["prompt"])
+    for filled in fill_template_rows(template, header, reader):
+        if filled is None:
+            skipped += 1
+            continue
+        if max_rows is not None and written >= max_rows:
+            break
+        writer.writerow([filled])
+        written += 1
+    return written, skipped
+
+def read_csv_header(uploaded_file):
+    """Yüklenen CSV dosyasının başlık satırını oku"""
+    uploaded_file.seek(0)
+    source = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        return [column.strip() for column in next(csv.reader(source), [])]
+    finally:
+        source.detach()
+
+# Streamlit indirme verisini bellekte bayt olarak tutar; uygulama içi çıktı bu yüzden sınırlıdır.
+# Sınırsız toplu doldurma için write_filled_templates dosyadan dosyaya sabit bellekle çalışır.
+BATCH_FILL_MAX_ROWS = 100_000
+
+def build_filled_templates_file(template, uploaded_file, max_rows=BATCH_FILL_MAX_ROWS):
+    """Toplu doldurma çıktısını geçici dosyada üretip indirme için bayt olarak döndür"""
+    uploaded_file.seek(0)
+    source = io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", errors="replace", newline="")
+    with tempfile.TemporaryFile() as output:
+        writer = io.TextIOWrapper(output, encoding="utf-8", newline="")
+        try:
+            write_filled_templates(template, source, writer, max_rows=max_rows)
+            writer.flush()
+        finally:
+            source.detach()
+            writer.detach()
+        output.seek(0)
+        return output.read()
+
+def display_batch_fill(template):
+    """CSV ile toplu şablon doldurma (mail-merge)"""
+    st.write("**📦 Toplu Doldurma (CSV):**")
+    st.caption(
+        f"Sütunlar: {', '.join(template.fields)} · İndirme en fazla {BATCH_FILL_MAX_ROWS:,} satır içerir"
+    )
+    uploaded_file = st.file_uploader(
+        "Alan değerleri dosyası:", type=["csv"], key=f"batch_{template.name}"
+    )
+    
+    if uploaded_file is not None:
+        missing = [field for field in template.fields if field not in read_csv_header(uploaded_file)]
+        if missing:
+            st.error(f"⚠️ CSV'de eksik sütunlar: {', '.join(missing)}")
+            return
+        
+        # Çıktı yalnızca indirme tıklandığında akış halinde üretilir
+        st.download_button(
+            "⬇️ Doldurulmuş Prompt'ları İndir",
+            data=functools.partial(build_filled_templates_file, template, uploaded_file),
+            file_name=f"{template.name}_doldurulmus.csv",
+            mime="text/csv",
+            on_click="ignore",
+            key=f"batch_download_{template.name}"
+        )
+
+@profiled_fragment
 def display_templates_tab():
     """Hazır şablonlar sekmesi"""
     st.header("📋 Hazır Prompt Şablonları")
     st.write("İş süreçleriniz için hazır şablonları kullanın ve özelleştirin.")
     
-    templates = {
-        "İş Analizi": {
-            "templates": [
-                {
-                    "name": "Rakip Analizi",
-                    "template": """Sen deneyimli bir iş analisti olarak hareket et. 
-
-{company_name} şirketinin {sector} sektöründeki ana rakiplerini analiz et:
-
-- Rakip şirketler: {competitors}
-- Analiz kapsamı: {analysis_scope}
-- Zaman dilimi: {time_period}
-
-Lütfen şunları içeren detaylı analiz sun:
-1. Rakiplerin güçlü/zayıf yönleri
-2. Pazar konumları 
-3. Fiyatlandırma stratejileri
-4. Bizim için fırsatlar ve tehditler
-5. Öneriler ve aksiyon planı""",
-                    "fields": ["company_name", "sector", "competitors", "analysis_scope", "time_period"]
-                }
-            ]
-        },
-        "Pazarlama": {
-            "templates": [
-                {
-                    "name": "Sosyal Medya Kampanyası",
-                    "template": """Sen 10 yıl deneyimli bir dijital pazarlama uzmanısın.
-
-{product_name} ürünü için sosyal medya kampanyası tasarla:
-
-- Hedef kitle: {target_audience}
-- Platformlar: {platforms}
-- Bütçe: {budget}
-- Süre: {duration}
-- Ana mesaj: {main_message}
-
-Lütfen şunları hazırla:
-1. Platform bazlı strateji
-2. İçerik takvimi (haftalık)
-3. Hashtag stratejisi
-4. Ölçüm metrikleri
-5. Bütçe dağılımı""",
-                    "fields": ["product_name", "target_audience", "platforms", "budget", "duration", "main_message"]
-                }
-            ]
-        },
-        "Satış": {
-            "templates": [
-                {
-                    "name": "B2B Satış Sunumu",
-                    "template": """Sen deneyimli bir B2B satış uzmanısın.
-
-{client_company} şirketine {product_service} için satış sunumu hazırla:
-
-- Müşteri profili: {client_profile}
-- Ürün/Hizmet: {product_service}
-- Fiyat aralığı: {price_range}
-- Ana itirazlar: {main_objections}
-- Karar verici: {decision_maker}
-
-Lütfen şunları içeren sunum hazırla:
-1. Açılış ve güven oluşturma
-2. İhtiyaç analizi soruları
-3. Çözüm sunumu
-4. Fayda vurguları
-5. İtiraz yönetimi
-6. Kapanış teknikleri""",
-                    "fields": ["client_company", "product_service", "client_profile", "price_range", "main_objections", "decision_maker"]
-                }
-            ]
-        }
-    }
+    templates = load_template_registry()
     
-    selected_category = st.selectbox("Kategori Seçin:", list(templates.keys()))
+    selected_category = st.selectbox(
+        "Kategori Seçin:", list(templates.keys()), **persistent_widget("template_category")
+    )
     
-    for template in templates[selected_category]["templates"]:
-        with st.expander(f"📋 {template['name']}", expanded=False):
+    for template in templates[selected_category]:
+        with st.expander(f"📋 {template.name}", expanded=False):
             col1, col2 = st.columns([3, 2])
             
             with col1:
                 st.write("**Şablon:**")
-                st.code(template["template"], language="text")
+                st.code(template.template, language="text")
             
             with col2:
                 st.write("**Gerekli Alanlar:**")
                 
                 # Form oluştur
-                with st.form(f"template_form_{template['name']}"):
+                with st.form(f"template_form_{template.name}"):
                     template_inputs = {}
+                    field_keys = [f"{template.name}_{field}" for field in template.fields]
                     
-                    for field in template["fields"]:
+                    for field, field_key in zip(template.fields, field_keys):
                         template_inputs[field] = st.text_input(
                             f"{field.replace('_', ' ').title()}:",
-                            key=f"{template['name']}_{field}"
+                            **persistent_widget(field_key, in_form=True)
                         )
                     
-                    if st.form_submit_button("🎯 Şablonu Doldur"):
+                    if st.form_submit_button("🎯 Şablonu Doldur", on_click=store_widget_values, args=(field_keys,)):
                         if all(template_inputs.values()):
-                            filled_template = template["template"].format(**template_inputs)
+                            filled_template = template.fill(template_inputs)
                             st.success("✅ Şablon dolduruldu!")
                             st.code(filled_template, language="text")
                         else:
                             st.error("⚠️ Tüm alanları doldurun.")
+            
+            display_batch_fill(template)
 
 def display_favorites():
-    """IWA Concept için öne çıkan roller"""
+    """Kullanıcının favorileri ve IWA Concept için öne çıkan roller"""
+    user_favorites = load_user_data()["favorites"]
+    if user_favorites:
+        st.subheader("⭐ Favorilerim")
+        for i, (act, prompt) in enumerate(user_favorites):
+            with st.expander(f"⭐ {act}", expanded=False):
+                st.code(prompt.replace('"', '').strip(), language="text")
+                st.button("💔 Favorilerden Çıkar", key=f"favorite_remove_{i}",
+                          on_click=toggle_favorite, args=(act, prompt))
+    
     st.subheader("⭐ IWA Concept için Öne Çıkan Roller")
     
     favorites = [
@@ -973,6 +2966,12 @@ def display_usage_guide():
 def main():
     """Ana uygulama"""
     
+    # Paylaşılan yapıların ısınmasını başlat (süreç başına bir kez)
+    warm_up = start_warm_up()
+    
+    # Kullanıcı kimliği ve verileri oturum başında bir kez çözülür (gerekirse çerez yazılır)
+    load_user_data()
+    
     # Başlık ve sekmeler
     tab1, tab2, tab3, tab4 = display_header()
     
@@ -1008,51 +3007,61 @@ def main():
         st.markdown("---")
         st.subheader("🚀 Hızlı Erişim")
         
-        if st.button("🎯 Prompt Kalite Testi", help="Prompt'unuzu hızlıca test edin"):
-            st.session_state['active_tab'] = 'quality'
+        st.button("🎯 Prompt Kalite Testi", help="Prompt'unuzu hızlıca test edin",
+                  on_click=open_tab, args=("quality",))
         
-        if st.button("⭐ Favori Prompts", help="En popüler prompts"):
-            st.session_state['active_tab'] = 'library'
+        st.button("⭐ Favori Prompts", help="En popüler prompts",
+                  on_click=open_tab, args=("library",))
             
-        if st.button("💡 İpucu Al", help="Prompt yazma ipuçları"):
-            st.session_state['active_tab'] = 'tips'
+        st.button("💡 İpucu Al", help="Prompt yazma ipuçları",
+                  on_click=open_tab, args=("tips",))
         
         st.markdown("---")
         st.markdown("### 📊 Günlük İstatistikler")
-        st.info("🎯 Analiz edilen prompt: **47**")
-        st.info("⭐ En yüksek skor: **94/100**")
-        st.info("📈 Ortalama kalite: **B+**")
+        analyzed_count, best_score, average_score = QUALITY_STATS.summary()
+        st.info(f"🎯 Analiz edilen prompt: **{analyzed_count}**")
+        st.info(f"⭐ En yüksek skor: **{best_score}/100**")
+        st.info(f"📈 Ortalama kalite: **{score_to_grade(average_score) if analyzed_count else '-'}**")
         
         st.markdown("---")
+        if warm_up.ready:
+            st.caption(f"⚙️ Sunucu hazır ({warm_up.elapsed:.1f} sn ısınma)")
+        else:
+            st.caption("⚙️ Sunucu ısınıyor...")
+        st.caption(f"📐 Puanlama kuralları v{get_scoring_plan().version}")
+        
         st.write("💡 **İpucu:** Her sekmede farklı özellikler var!")
     
     # Prompts'ları yükle
     with st.spinner("🔄 GitHub'dan prompts yükleniyor..."):
-        df = load_prompts()
+        df = get_corpus()
+    
+    # Kaynak hataları: diğer kaynaklar yüklendiyse uyarı, hiçbiri yüklenemediyse hata
+    report = st.error if df is None else st.warning
+    for message in CORPUS_REFRESH["errors"]:
+        report(message)
     
     if df is None:
         st.error("❌ Prompts yüklenemedi. İnternet bağlantınızı kontrol edin.")
+        st.info("💡 İnternet bağlantınızı kontrol edin veya sayfayı yenileyin")
         return
     
-    # Ana sekmeler
-    with tab1:
-        st.success(f"✅ {len(df)} prompt başarıyla yüklendi!")
-        display_library_tab(df)
-        
-        # Öne çıkan roller
-        display_favorites()
-        
-        # Kullanım kılavuzu
-        display_usage_guide()
+    # Ana sekmeler: yalnızca açık sekme çalışır, widget'lar kendi fragment'ını yeniden çalıştırır
+    if tab1.open:
+        with tab1:
+            display_library_section(df)
     
-    with tab2:
-        display_usage_tips_tab()
+    if tab2.open:
+        with tab2:
+            display_usage_tips_tab()
         
-    with tab3:
-        display_templates_tab()
+    if tab3.open:
+        with tab3:
+            display_templates_tab()
         
-    with tab4:
-        display_quality_control_tab()
+    if tab4.open:
+        with tab4:
+            display_quality_control_tab(df)
     
     # Footer
     st.markdown("---")
@@ -1067,5 +3076,25 @@ def main():
         unsafe_allow_html=True
     )
 
+def serve(streamlit_args):
+    """Önyükleme kancası: ısınmayı bu süreçte bitir, ardından Streamlit sunucusunu aynı süreçte başlat"""
+    # cache_resource süreç genelinde olduğundan sunucunun ilk çalıştırması hazır yapıları bulur;
+    # start_warm_up aynı önbellek kaydını döndürür, ilk kullanıcı indirme ve indeks kurulumu beklemez
+    state = start_warm_up()
+    state.wait()
+    print_warm_up_report(state)
+    from streamlit.web import cli as stcli
+    sys.argv = ["streamlit", "run", os.path.abspath(__file__), *streamlit_args]
+    sys.exit(stcli.main())
+
 if __name__ == "__main__":
-    main()
+    if "--serve" in sys.argv and not st.runtime.exists():
+        # Isınmış sunucu: python iwaprompt.py --serve [streamlit seçenekleri]
+        serve([arg for arg in sys.argv[1:] if arg != "--serve"])
+    elif "--warm-up-report" in sys.argv:
+        # Yalnızca ölçüm: ısınma görevlerinin sürelerini ayrı bir süreçte raporlar, sunucuyu ısıtmaz
+        print_warm_up_report(run_warm_up())
+    elif profiling_requested():
+        run_profiled(main)
+    else:
+        main()
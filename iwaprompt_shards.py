@@ -0,0 +1,70 @@
+"""Parçalı arama indeksi ve işçi süreç döngüsü.
+
+Streamlit betiği içe aktarılabilir bir modül olmadığından işçi süreçler
+(forkserver/spawn) hedef fonksiyonu buradan yükler; bu modül streamlit'e bağlı değildir.
+"""
+import numpy as np
+
+REGEX_SPECIAL = set(".^$*+?{}[]\\|()")
+
+
+def _shard_contains(lowered, original, term):
+    """filter_prompts ile aynı eşleşme; düz metin terimler önceden küçültülmüş sütunda aranır"""
+    if REGEX_SPECIAL.isdisjoint(term):
+        return lowered.str.contains(term.lower(), regex=False).to_numpy(dtype=bool)
+    return original.str.contains(term, case=False, na=False).to_numpy(dtype=bool)
+
+
+class ShardIndex:
+    """Korpusun bir parçası için arama indeksi (küçük harfli sütunlar ve token sayıları)"""
+
+    def __init__(self, df, token_counts):
+        self.ids = df.index.to_numpy()
+        self.act = df['act']
+        self.prompt = df['prompt']
+        self.act_lower = self.act.fillna("").astype(str).str.lower()
+        self.prompt_lower = self.prompt.fillna("").astype(str).str.lower()
+        self.tokens = np.asarray(token_counts, dtype=np.int64)
+
+    def query(self, search_term, selected_role, limit):
+        """(eşleşme sayısı, toplam token, korpus sırasıyla ilk limit etiket) döndür"""
+        mask = np.ones(len(self.ids), dtype=bool)
+        if search_term:
+            mask = (
+                _shard_contains(self.act_lower, self.act, search_term)
+                | _shard_contains(self.prompt_lower, self.prompt, search_term)
+            )
+        if selected_role != "Tümü":
+            mask &= _shard_contains(self.act_lower, self.act, selected_role)
+        ids = self.ids[mask]
+        return len(ids), int(self.tokens[mask].sum()), ids[:limit]
+
+
+def merge_shard_results(results, limit):
+    """Parça sonuçlarını birleştir; parçalar korpus sırasında olduğundan ilk k birleştirme sırayı korur"""
+    count = sum(result[0] for result in results)
+    tokens = sum(result[1] for result in results)
+    ids = np.concatenate([result[2] for result in results]) if results else np.zeros(0, dtype=np.int64)
+    return count, tokens, ids[:limit]
+
+
+def shard_worker(connection, df, token_counts):
+    """İşçi süreç döngüsü: parçanın indeksini kur, (istek no, sorgu) mesajlarını yanıtla"""
+    index = ShardIndex(df, token_counts)
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        request_id, query = message
+        try:
+            result = index.query(*query)
+        except Exception as e:
+            result = e
+        try:
+            connection.send((request_id, result))
+        except OSError:
+            break
+    connection.close()